@@ -18,6 +18,44 @@ BROWSER = os.getenv("BROWSER", "chrome")
 IMPLICIT_WAIT = int(os.getenv("IMPLICIT_WAIT", 5))
 EXPLICIT_WAIT = int(os.getenv("EXPLICIT_WAIT", 10))
 
+# Driver binaries resolved by webdriver-manager are cached here across workers and runs
+DRIVER_CACHE = os.getenv("DRIVER_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "clinic-selenium", "drivers.json"))
+
+# Allure results directory (also the source of historical durations for scheduling)
+REPORTS_DIR = os.getenv("REPORTS_DIR", "reports")
+
+# Packed Allure results (opt-in): stream into per-run archives under <alluredir>/runs and keep this many runs.
+# Packed runs must be expanded before `allure generate` (python -m utils.allure_store expand)
+ALLURE_PACKED = os.getenv("ALLURE_PACKED", "0") == "1"
+ALLURE_KEEP_RUNS = int(os.getenv("ALLURE_KEEP_RUNS", 20))
+# Results per archive segment; a crashed worker loses at most one open segment
+ALLURE_SEGMENT_SIZE = int(os.getenv("ALLURE_SEGMENT_SIZE", 25))
+
+# Visual checks: baseline images, allowed ratio of differing pixels, and re-record switch
+VISUAL_BASELINE_DIR = os.getenv("VISUAL_BASELINE_DIR", os.path.join("data", "baselines"))
+VISUAL_THRESHOLD = float(os.getenv("VISUAL_THRESHOLD", 0.001))
+VISUAL_UPDATE = os.getenv("VISUAL_UPDATE", "0") == "1"
+
+# Resource monitoring: growth from test start to end above which a test is flagged as leaking
+RESOURCE_RSS_GROWTH_MB = float(os.getenv("RESOURCE_RSS_GROWTH_MB", 300))
+RESOURCE_HEAP_GROWTH_MB = float(os.getenv("RESOURCE_HEAP_GROWTH_MB", 50))
+RESOURCE_DOM_GROWTH = int(os.getenv("RESOURCE_DOM_GROWTH", 5000))
+
+# Upload fixtures: pre-processed image variants cache, longest side in pixels (0, the default, keeps the
+# original size, so resizing is opt-in), format ("" keeps it)
+UPLOAD_CACHE_DIR = os.getenv("UPLOAD_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "clinic-selenium", "uploads"))
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", 0))
+UPLOAD_FORMAT = os.getenv("UPLOAD_FORMAT", "")
+
+# Backend endpoints (JavaScript regexes, taken from real traffic) whose response confirms a UI action.
+# Unset: the first mutating request after the click is taken for the action and a warning is logged.
+ENDPOINT_SAVE_EXAM = os.getenv("ENDPOINT_SAVE_EXAM", "")
+ENDPOINT_CONFIRM_EXAM = os.getenv("ENDPOINT_CONFIRM_EXAM", "")
+ENDPOINT_PAYMENT = os.getenv("ENDPOINT_PAYMENT", "")
+
+# Logging
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+
 # Retry settings
 MAX_RETRY_ATTEMPTS = 3
 
@@ -1,35 +1,99 @@
 """Pytest configuration and fixtures."""
 
+import json
 import pytest
 import logging
-import os
-from selenium.webdriver.support.ui import WebDriverWait
-from utils.driver_factory import get_driver
+import sys
+from utils.logger import setup_logging, shutdown_logging, start_test_log, stop_test_log, flush_test_log
 import config.config as cfg
 
-# Cấu hình logging
-log_directory = "logs"
-if not os.path.exists(log_directory):
-    os.makedirs(log_directory)
-log_file = os.path.join(log_directory, "test_log.log")
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# allure_store first: utils.scheduler imports it, and pytest must import (and assert-rewrite) it as a plugin
+pytest_plugins = ["utils.allure_store", "utils.scheduler", "utils.manifest"]
+
+def pytest_configure(config):
+    """Route logging through the queue-based, per-worker/per-test JSON sinks."""
+    setup_logging(cfg.LOG_DIR)
+
+def pytest_unconfigure(config):
+    """Stop this worker's driver service and flush pending log records."""
+    # Selenium is imported lazily; if no test needed a driver there is no service to stop
+    if "utils.driver_factory" in sys.modules:
+        sys.modules["utils.driver_factory"].stop_services()
+    shutdown_logging()
+
+TEST_LOG_PATH = pytest.StashKey[str]()
+
+@pytest.fixture(autouse=True)
+def test_log(request):
+    """Write this test's records to its own file (attached by pytest_runtest_makereport)."""
+    path = start_test_log(request.node.nodeid, cfg.LOG_DIR)
+    request.node.stash[TEST_LOG_PATH] = path
+    yield path
+    stop_test_log()
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Attach the test's structured log to its Allure result once the test body has run."""
+    yield
+    path = item.stash.get(TEST_LOG_PATH, None)
+    if call.when != "call" or path is None:
+        return
+    flush_test_log(item.nodeid)
+    try:
+        import allure
+        allure.attach.file(path, name="structured log", attachment_type=allure.attachment_type.TEXT)
+    except (ImportError, FileNotFoundError):
+        pass
+
+def _report_resources(request, monitor):
+    """Attach the resource time series to Allure and flag the test if it grew past the thresholds."""
+    exceeded = monitor.exceeded()
+    request.node.user_properties.append(("resource_growth", monitor.growth()))
+    if exceeded:
+        logger.warning(f"Resource growth over threshold in {request.node.nodeid}: {exceeded}")
+    try:
+        import allure
+        allure.attach(monitor.to_json(), name="resource usage", attachment_type=allure.attachment_type.JSON)
+        if exceeded:
+            allure.dynamic.tag("resource-leak")
+    except ImportError:
+        pass
+
+def _report_network(request, driver):
+    """Attach the backend request timings of network-confirmed actions."""
+    timings = getattr(driver, "network_timings", [])
+    if not timings:
+        return
+    request.node.user_properties.append(("backend_timings", timings))
+    try:
+        import allure
+        allure.attach(json.dumps(timings, indent=2), name="backend timings", attachment_type=allure.attachment_type.JSON)
+    except ImportError:
+        pass
+
 @pytest.fixture(scope="function")
-def driver():
+def driver(request):
     """Fixture to initialize and teardown WebDriver."""
+    from utils.driver_factory import get_driver
+    from utils.resource_monitor import ResourceMonitor
+
     logger.info("Setting up test environment...")
     driver = get_driver(cfg.BROWSER)
-    driver.implicitly_wait(cfg.IMPLICIT_WAIT)
-    driver.get(cfg.BASE_URL)
+    try:
+        driver.implicitly_wait(cfg.IMPLICIT_WAIT)
+        driver.get(cfg.BASE_URL)
+        driver.resource_monitor = ResourceMonitor(driver)
+        driver.resource_monitor.sample("setup")
+    except Exception:
+        driver.quit()
+        raise
     yield driver
     logger.info("Tearing down test environment...")
-    driver.quit()
\ No newline at end of file
+    try:
+        driver.resource_monitor.sample("teardown")
+        _report_resources(request, driver.resource_monitor)
+        _report_network(request, driver)
+    finally:
+        driver.quit()  # ends the session only; the driver service is reused by the next test
@@ -1,21 +1,56 @@
 import time
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from utils.wait import BrowserWait
+from utils import conditions as EC
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException
 
 from utils.retry import retry_on_failure
+from utils.dom_snapshot import DomSnapshot
+from utils.notifications import NotificationRecorder
+from utils.network import NetworkMonitor
+from utils.visual import VisualCheck
+import config.config as cfg
 
 class ExaminationPage:
     """Manages interactions with the examination page of the EMR system."""
 
+    # Medicines prescribed by configure_prescription when none are given
+    DEFAULT_MEDICINES = [
+        {"name": "Nước cất tiêm 2ml (AM100007-N/A)", "prefix": "water"},
+        {"name": "Thuốc xịt mũi Thái Dương (AM100008-N/A)", "prefix": "spray"}
+    ]
+
+    # Editable columns of a prescription row (keys of locators["prescription"]["row_inputs"])
+    ROW_FIELDS = ("morning", "afternoon", "evening", "night", "duration", "quantity", "note")
+
+    # Sets values via the native setter and fires the events React listens to; returns unresolved xpaths
+    BATCH_FILL_SCRIPT = """
+        var missing = [];
+        arguments[0].forEach(function (entry) {
+            var el = document.evaluate(entry[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            if (!el || el.disabled || el.readOnly) { missing.push(entry[0]); return; }
+            var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            el.focus();
+            Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, entry[1]);
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+            el.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+            el.blur();
+        });
+        return missing;
+    """
+
     def __init__(self, driver):
         """Initialize the ExaminationPage with a WebDriver instance."""
         self.driver = driver
-        self.wait = WebDriverWait(driver, 50)
+        self.wait = BrowserWait(driver, 50)
         self.action_chain = ActionChains(driver)
+        self.snapshot = DomSnapshot(driver)
+        self.notifications = NotificationRecorder(driver)
+        self.network = NetworkMonitor(driver)
+        self.visual = VisualCheck(driver)
 
         # Centralized locator dictionary
         self.locators = {
@@ -72,6 +107,8 @@ class ExaminationPage:
                 "medicine_search": (By.XPATH, "//div[contains(@class, 'ant-select sc-fCdBJp byMnNB ant-select-single ant-select-show-arrow ant-select-show-search')]"),
                 "water_injection": (By.XPATH, "//span[contains(text(), 'Nước cất tiêm 2ml (AM100007-N/A)')]"),
                 "nasal_spray": (By.XPATH, "//span[contains(text(), 'Thuốc xịt mũi Thái Dương (AM100008-N/A)')]"),
+                "medicine_option": "//span[contains(text(), '{name}')]",
+                "medicine_row": "//tr[@data-row-key][.//*[contains(normalize-space(.), '{name}')]]",
                 "row_inputs": {
                     "morning": "//tr[@data-row-key='{row_key}']//td[3]//div[1]//input[1]",
                     "afternoon": "//tr[@data-row-key='{row_key}']//td[4]//div[1]//input[1]",
@@ -89,6 +126,13 @@ class ExaminationPage:
                 "payment": (By.XPATH, "//span[normalize-space()='Thanh toán']"),
                 "toast_message": (By.XPATH, "//div[contains(@class, 'ant-notification-notice-message')]"),
                 "exam_status": (By.XPATH, "//div[contains(@class, 'ant-col-12')]//input[@value='Khám xong']"),
+                # Subtree holding the exam status field, snapshotted by is_exam_completed
+                "status_root": (By.XPATH, "//form[contains(@class, 'ant-form')]"),
+            },
+            "visual": {
+                "form": (By.XPATH, "//form[contains(@class, 'ant-form')]"),
+                # Dynamic content ignored by visual checks (dates/times)
+                "masks": ["//div[contains(@class, 'ant-picker')]", "//input[@placeholder='Vui lòng chọn thời gian']"]
             }
         }
 
@@ -264,43 +308,83 @@ class ExaminationPage:
         """
         for field, value in data_dict.items():
             locator = (By.XPATH, self._get_row_locator(field, row_key))
-            if field in ["morning", "afternoon", "evening", "night", "duration", "quantity", "note"]:
+            if field in self.ROW_FIELDS:
                 self._input_field(locator, value)
             time.sleep(0.2)
 
-    @retry_on_failure()
-    def configure_prescription(self, data):
+    def fill_fields(self, fields):
         """
-        Configure prescription details for multiple rows of medicines.
+        Fill several input/textarea fields with a single script call.
+        Values are written through the native value setter so React/antd picks them up.
+        Fields the script cannot resolve fall back to _input_field.
         Args:
-            data (dict): Dictionary containing prescription details for each medicine.
+            fields (list): List of (xpath, value) pairs.
         """
+        if not fields:
+            return
+        missing = self.driver.execute_script(self.BATCH_FILL_SCRIPT, [[xpath, str(value if value is not None else "")] for xpath, value in fields])
+        values = dict(fields)
+        for xpath in missing or []:
+            self._input_field((By.XPATH, xpath), values[xpath])
+        time.sleep(0.5)
+
+    @retry_on_failure()
+    def open_prescription_tab(self):
+        """Open the 'Đơn thuốc' tab."""
         tab = self.wait.until(EC.element_to_be_clickable(self.locators["prescription"]["don_thuoc_tab"]))
         self._scroll_to(tab)
         self.driver.execute_script("arguments[0].click();", tab)
-        self._input_field(self.locators["prescription"]["doctor_advice"], data.get("doctor_advice", ""))
 
-        medicines = {
-            "water_injection": {
-                "locator": self.locators["prescription"]["water_injection"],
-                "row_key": "4319",
-                "prefix": "water"
-            },
-            "nasal_spray": {
-                "locator": self.locators["prescription"]["nasal_spray"],
-                "row_key": "4320",
-                "prefix": "spray"
-            }
-        }
+    @retry_on_failure()
+    def add_medicine(self, name):
+        """
+        Add a medicine to the prescription table, unless a row for it is already there.
+        The existing-row check keeps retries from adding the medicine twice.
+        Args:
+            name (str): Option text of the medicine (e.g., 'Nước cất tiêm 2ml (AM100007-N/A)').
+        Returns:
+            str: The data-row-key of the medicine row.
+        """
+        row_xpath = self.locators["prescription"]["medicine_row"].format(name=name)
+        existing = self.driver.find_elements(By.XPATH, row_xpath)
+        if existing:
+            return existing[0].get_attribute("data-row-key")
+        search = self.wait.until(EC.element_to_be_clickable(self.locators["prescription"]["medicine_search"]))
+        search.click()
+        self.wait.until(EC.visibility_of_element_located((By.XPATH, "//div[contains(@class, 'ant-select-dropdown')]")))
+        option_xpath = self.locators["prescription"]["medicine_option"].format(name=name)
+        self.wait.until(EC.element_to_be_clickable((By.XPATH, option_xpath))).click()
+        row = self.wait.until(EC.presence_of_element_located((By.XPATH, row_xpath)))
+        return row.get_attribute("data-row-key")
 
-        for med_name, med_config in medicines.items():
-            search = self.wait.until(EC.element_to_be_clickable(self.locators["prescription"]["medicine_search"]))
-            search.click()
-            self.wait.until(EC.visibility_of_element_located((By.XPATH, "//div[contains(@class, 'ant-select-dropdown')]")))
-            medicine = self.wait.until(EC.element_to_be_clickable(med_config["locator"]))
-            medicine.click()
+    def fill_prescription_rows(self, rows):
+        """
+        Fill several prescription rows in one batch.
+        Args:
+            rows (list): List of (row_key, data_dict) pairs; data_dict keys match row_inputs.
+        """
+        fields = []
+        for row_key, data_dict in rows:
+            for field, value in data_dict.items():
+                if field in self.locators["prescription"]["row_inputs"]:
+                    fields.append((self._get_row_locator(field, row_key), value))
+        self.fill_fields(fields)
+
+    @retry_on_failure()
+    def configure_prescription(self, data, medicines=None):
+        """
+        Configure prescription details for multiple rows of medicines.
+        Args:
+            data (dict): Dictionary containing prescription details for each medicine.
+            medicines (list): Optional list of {"name", "prefix"} dicts; defaults to DEFAULT_MEDICINES.
+        """
+        self.open_prescription_tab()
+        self._input_field(self.locators["prescription"]["doctor_advice"], data.get("doctor_advice", ""))
 
-            row_data = {
+        rows = []
+        for med_config in medicines or self.DEFAULT_MEDICINES:
+            row_key = self.add_medicine(med_config["name"])
+            rows.append((row_key, {
                 "morning": data.get(f"{med_config['prefix']}_morning", 0),
                 "afternoon": data.get(f"{med_config['prefix']}_afternoon", 0),
                 "evening": data.get(f"{med_config['prefix']}_evening", 0),
@@ -308,20 +392,19 @@ class ExaminationPage:
                 "duration": data.get(f"{med_config['prefix']}_duration", 0),
                 "quantity": data.get(f"{med_config['prefix']}_quantity", 0),
                 "note": data.get(f"{med_config['prefix']}_note", "")
-            }
-            self._fill_row_data(med_config["row_key"], row_data)
-            time.sleep(0.5)
+            }))
+        self.fill_prescription_rows(rows)
 
     @retry_on_failure()
     def save_exam(self):
-        """Save the current examination."""
+        """Save the current examination and wait for the save request to complete."""
         button = self.wait.until(EC.element_to_be_clickable(self.locators["actions"]["save"]))
         self._scroll_to(button)
-        self.driver.execute_script("arguments[0].click();", button)
+        self.network.click_and_wait(button, "save_exam", cfg.ENDPOINT_SAVE_EXAM)
 
     @retry_on_failure()
     def finish_exam(self):
-        """Mark the examination as complete."""
+        """Mark the examination as complete (opens the confirmation dialog; the request is sent by confirm_exam)."""
         button = self.wait.until(EC.element_to_be_clickable(self.locators["actions"]["finish_exam"]))
         self._scroll_to(button)
         self.driver.execute_script("arguments[0].click();", button)
@@ -331,29 +414,51 @@ class ExaminationPage:
         """Confirm the examination completion."""
         button = self.wait.until(EC.element_to_be_clickable(self.locators["actions"]["confirm"]))
         self._scroll_to(button)
-        button.click()
-        self.wait.until(EC.visibility_of_element_located(self.locators["actions"]["toast_message"]))
+        seq = self.notifications.mark()
+        self.network.click_and_wait(button, "confirm_exam", cfg.ENDPOINT_CONFIRM_EXAM)
+        self.notifications.wait_for(since=seq, timeout=50)
 
     @retry_on_failure()
     def proceed_to_payment(self):
-        """Navigate to the payment page."""
+        """Navigate to the payment page, returning once its first backend request completes."""
         button = self.wait.until(EC.element_to_be_clickable(self.locators["actions"]["payment"]))
         self._scroll_to(button)
-        self.driver.execute_script("arguments[0].click();", button)
+        self.network.click_and_wait(button, "proceed_to_payment", cfg.ENDPOINT_PAYMENT, methods=None, timeout=10, required=False)
 
-    def verify_toast(self, expected_text):
+    def verify_toast(self, expected_text, since=0):
         """Verify the toast message content.
         Args:
             expected_text (str): Expected text in the toast message.
+            since (int): Only accept toasts recorded after this notifications.mark() value.
+        """
+        try:
+            self.notifications.wait_for(expected_text, since=since, timeout=50)
+        except TimeoutException:
+            messages = [entry["message"] for entry in self.notifications.entries()]
+            raise AssertionError(f"Expected: {expected_text}, Got: {messages}")
+
+    def verify_visual(self, name, region=None, masks=()):
+        """Compare a region of the examination screen against its visual baseline.
+        Args:
+            name (str): Baseline name.
+            region (tuple): Locator of the region; defaults to the examination form.
+            masks (list): Extra XPaths of dynamic content (e.g. patient name) to ignore.
+        Returns:
+            bool: True if the region matches the baseline.
         """
-        toast = self.wait.until(EC.visibility_of_element_located(self.locators["actions"]["toast_message"]))
-        assert expected_text in toast.text, f"Expected: {expected_text}, Got: {toast.text}"
+        element = self.wait.until(EC.visibility_of_element_located(region or self.locators["visual"]["form"]))
+        return self.visual.check(name, element, self.locators["visual"]["masks"] + list(masks))
 
     def is_exam_completed(self):
         """Check if the examination status is 'Khám xong'.
         Returns:
             bool: True if examination is completed, False otherwise.
         """
+        # Once the form is rendered its snapshot answers; the wait is only for a form not shown yet
+        form = self.snapshot.get(root_xpath=self.locators["actions"]["status_root"][1]).root
+        if form is not None:
+            return any(col.find(tag="input", attrs={"value": "Khám xong"})
+                       for col in form.find_all(tag="div", css_class="ant-col-12"))
         try:
             status = self.wait.until(EC.presence_of_element_located(self.locators["actions"]["exam_status"]), 10)
             return status.get_attribute("value") == "Khám xong"
@@ -2,19 +2,24 @@
 
 import time
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from utils.wait import BrowserWait
+from utils import conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from utils.retry import retry_on_failure
+from utils.notifications import NotificationRecorder
+from utils.upload_cache import upload_files
+from pages.table_component import AntdTable
 
 class PatientPage:
     def __init__(self, driver):
         """Initialize PatientPage with WebDriver instance."""
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        self.wait = BrowserWait(driver, 10)
         self.actions = ActionChains(driver)
+        self.notifications = NotificationRecorder(driver)
+        self.table = AntdTable(driver, type(self).__name__)
 
         # Locators
         self.patient_tab_button = (By.XPATH, "//div[@class='ant-collapse-item ant-collapse-item-active sc-coCPJf eqFRNs']//div[@class='ant-collapse-content ant-collapse-content-active']//div[2]//div[1]//div[1]//div[1]//div[1]//div[2]//div[1]")
@@ -44,11 +49,12 @@ class PatientPage:
         self.wait.until(EC.element_to_be_clickable(self.patient_tab_button)).click()
 
     def select_patient(self, patient_index):
-        """Select a patient by index from the table."""
+        """Select a patient by index from the table, moving to the page that holds it."""
         if patient_index < 1:
             raise ValueError("Patient index must be positive.")
-        patient_row = (By.XPATH, f"(//tr[contains(@class, 'ant-table-row')])[{patient_index}]")
-        self.wait.until(EC.element_to_be_clickable(patient_row)).click()
+        row = self.table.row_at(patient_index)
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
+        row.click()
 
     @retry_on_failure()
     def click_appointment_button(self):
@@ -75,10 +81,9 @@ class PatientPage:
         option_el.click()
 
     def _upload_images(self, image_paths):
-        """Upload one or multiple images using the file input element."""
+        """Upload one or multiple images using the file input element (pre-processed and cached)."""
         input_el = self.wait.until(EC.presence_of_element_located(self.upload_input))
-        for path in image_paths:
-            input_el.send_keys(path)
+        upload_files(self.driver, input_el, image_paths)
         self.wait.until(EC.visibility_of_element_located((By.XPATH, "//div[contains(@class, 'ant-upload-list')]")))
 
     def _select_service_nhi_khoa_d(self):
@@ -135,6 +140,18 @@ class PatientPage:
         time.sleep(2)
         self._click_examine_now()
 
+    def verify_toast(self, expected_text, timeout=10, since=0):
+        """Verify a toast containing the expected text was shown.
+        Args:
+            expected_text (str): Expected text in the toast message.
+            since (int): Only accept toasts recorded after this notifications.mark() value.
+        """
+        try:
+            self.notifications.wait_for(expected_text, since=since, timeout=timeout)
+        except TimeoutException:
+            messages = [entry["message"] for entry in self.notifications.entries()]
+            raise AssertionError(f"Expected: {expected_text}, Got: {messages}")
+
     def submit_appointment(self):
         """Submit the appointment (legacy method)."""
         self._click_examine_now()
\ No newline at end of file
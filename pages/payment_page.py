@@ -1,11 +1,15 @@
 """Page Object for Payment page."""
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from utils.wait import BrowserWait
+from utils import conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from utils.retry import retry_on_failure
+from utils.dom_snapshot import DomSnapshot
+from utils.network import NetworkMonitor
+from utils.visual import VisualCheck
+import config.config as cfg
 
 class PaymentPage:
     """Page Object representing the Payment section."""
@@ -13,13 +17,20 @@ class PaymentPage:
     def __init__(self, driver):
         """Initialize PaymentPage with WebDriver instance."""
         self.driver = driver
-        self.wait = WebDriverWait(driver, 50)
+        self.wait = BrowserWait(driver, 50)
+        self.snapshot = DomSnapshot(driver)
+        self.network = NetworkMonitor(driver)
+        self.visual = VisualCheck(driver)
         
         # Locators
         self.completeButton = (By.XPATH, "//span[normalize-space()='Hoàn thành']")
         self.confirmButton = (By.XPATH, "//span[contains(text(), 'Xác nhận')]")
         self.paymentStatus = (By.XPATH, "//div[label[@class='sc-bKhNmF KeDvq' and normalize-space()='Trạng thái thanh toán']]//span[@class='ant-select-selection-item' and @title='Đã thanh toán']")
+        # Field container of the payment status, snapshotted by isPaymentCompleted
+        self.paymentStatusRoot = "//div[label[normalize-space()='Trạng thái thanh toán']]"
         self.confirmPopup = (By.XPATH, "//div[@class='sc-iIPllB gIvmZg']")
+        self.paymentForm = (By.XPATH, "//form[contains(@class, 'ant-form')]")
+        self.visualMasks = ["//div[contains(@class, 'ant-picker')]"]
 
     @retry_on_failure()
     def clickCompleteButton(self):
@@ -32,21 +43,25 @@ class PaymentPage:
 
     @retry_on_failure()
     def clickConfirmButton(self):
-        """Click the 'Xác nhận' button on the confirmation popup."""
+        """Click the 'Xác nhận' button on the confirmation popup and wait for the payment request."""
         try:
             button = self.wait.until(EC.element_to_be_clickable(self.confirmButton), 20)  # Tăng thời gian chờ
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-            button.click()
-            # Chờ popup biến mất để xác nhận hành động hoàn tất
-            self.wait.until(EC.invisibility_of_element_located(self.confirmPopup))
         except TimeoutException:
             raise Exception("Không thể nhấp vào nút 'Xác nhận' sau khi nhấn 'Hoàn thành'. Vui lòng kiểm tra locator hoặc giao diện.")
+        self.network.click_and_wait(button, "confirm_payment", cfg.ENDPOINT_PAYMENT)
+        # Chờ popup biến mất để xác nhận hành động hoàn tất
+        self.wait.until(EC.invisibility_of_element_located(self.confirmPopup))
 
     def isPaymentCompleted(self):
         """Check if payment status is 'Đã thanh toán'.
         Returns:
             bool: True if payment is completed, False otherwise.
         """
+        # Once the status field is rendered its snapshot answers; the wait is only for a field not shown yet
+        field = self.snapshot.get(root_xpath=self.paymentStatusRoot).root
+        if field is not None:
+            return field.find(tag="span", css_class="ant-select-selection-item", attrs={"title": "Đã thanh toán"}) is not None
         try:
             status_element = self.wait.until(EC.presence_of_element_located(self.paymentStatus), 10)
             status_value = status_element.text.strip()
@@ -54,6 +69,18 @@ class PaymentPage:
         except (TimeoutException, NoSuchElementException):
             return False
 
+    def verifyVisual(self, name, region=None, masks=()):
+        """Compare a region of the payment screen against its visual baseline.
+        Args:
+            name (str): Baseline name.
+            region (tuple): Locator of the region; defaults to the payment form.
+            masks (list): Extra XPaths of dynamic content (e.g. patient name) to ignore.
+        Returns:
+            bool: True if the region matches the baseline.
+        """
+        element = self.wait.until(EC.visibility_of_element_located(region or self.paymentForm))
+        return self.visual.check(name, element, self.visualMasks + list(masks))
+
     def isConfirmPopupPresent(self):
         """Check if the confirmation popup is present."""
         try:
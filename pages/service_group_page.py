@@ -2,17 +2,26 @@
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from utils.wait import BrowserWait
+from utils import conditions as EC
 from selenium.common.exceptions import ElementClickInterceptedException
 from utils.retry import retry_on_failure
+from utils.dom_snapshot import DomSnapshot
+from utils.notifications import NotificationRecorder
+from pages.table_component import AntdTable
 
 class ServiceGroupPage:
     """Page object for managing service group operations."""
 
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        self.wait = BrowserWait(driver, 10)
+        self.snapshot = DomSnapshot(driver)
+        self.notifications = NotificationRecorder(driver)
+        self.table = AntdTable(driver, type(self).__name__, search_locator=self.LOCATORS["search_input"],
+                               text_column=self.NAME_COLUMN)
+        # Notification sequence number taken just before each operation's confirm click
+        self._marks = {}
 
     # Locators
     LOCATORS = {
@@ -23,8 +32,13 @@ class ServiceGroupPage:
         "group_name_input": (By.XPATH, "//label[contains(., 'Tên nhóm dịch vụ')]/following::input[1]"),
         "description_input": (By.XPATH, "//label[contains(., 'Mô tả')]/following::textarea[1]"),
         "confirm_button": (By.XPATH, "//span[contains(text(), 'Xác nhận')]"),
+        "table_body": (By.XPATH, "//tbody[@class='ant-table-tbody']"),
+        "search_input": (By.XPATH, "//input[contains(@placeholder, 'Tìm kiếm')]"),
     }
 
+    # Table column holding the group name, indexed for lookups by name
+    NAME_COLUMN = "Tên nhóm dịch vụ"
+
     # Messages
     MESSAGES = {
         "add_success": "Thêm nhóm dịch vụ thành công",
@@ -46,15 +60,27 @@ class ServiceGroupPage:
         element.send_keys(Keys.DELETE)
         element.send_keys(value)
 
-    def _wait_for_toast(self, message, timeout=7):
-        """Wait for the latest toast message containing the given text."""
-        xpath = f"(//div[contains(@class,'ant-notification-notice-message')][contains(., '{message}')])[last()]"
-        return self.wait.until(EC.visibility_of_element_located((By.XPATH, xpath)), timeout)
+    def _wait_for_toast(self, message, since=0, timeout=7):
+        """Wait for a toast containing the given text, recorded after sequence number `since`."""
+        return self.notifications.wait_for(message, since=since, timeout=timeout)
+
+    def _confirm(self, operation):
+        """Click the modal's confirm button, marking the notification buffer first.
+        Every confirmed operation adds, renames or removes a row, so the table's page index is cleared.
+        """
+        self._marks[operation] = self.notifications.mark()
+        self.wait.until(EC.element_to_be_clickable(self.LOCATORS["confirm_button"])).click()
+        self.table.invalidate()
+        return self._marks[operation]
 
     def _get_row_locator(self, name):
         """Return locator for a row cell with the given name."""
         return (By.XPATH, f"//tbody[@class='ant-table-tbody']//td[normalize-space()='{name}']")
 
+    def _row_in_snapshot(self, name):
+        """Check a row cell with the given name against the cached table snapshot."""
+        return self.snapshot.get(self.LOCATORS["table_body"][1]).exists(tag="td", text=name)
+
     def _wait_for_row(self, name, present=True, timeout=10):
         """Wait for a row to be present or absent."""
         locator = self._get_row_locator(name)
@@ -64,7 +90,8 @@ class ServiceGroupPage:
     def _click_action(self, group_name, action):
         """Click the specified action (edit/delete) for the given group."""
         icon = "ic-edit.svg" if action == "edit" else "ic-delete.svg"
-        row_xpath = f"//tbody[@class='ant-table-tbody']//tr[td[normalize-space()='{group_name}']]"
+        row_key = self.table.find_row(text=group_name).get_attribute("data-row-key")
+        row_xpath = f"//tbody[@class='ant-table-tbody']//tr[@data-row-key='{row_key}']"
         icon_xpath = f"{row_xpath}//td[last()]//img[@src='/images/{icon}']"
         if action == "delete":
             icon_xpath += "[not(contains(@class,'action-disabled'))]"
@@ -91,9 +118,8 @@ class ServiceGroupPage:
         self.wait.until(EC.element_to_be_clickable(self.LOCATORS["specialty_nhi_khoa"])).click()
         self._input_text(self.LOCATORS["group_name_input"], group_name)
         self._input_text(self.LOCATORS["description_input"], description)
-        self.wait.until(EC.element_to_be_clickable(self.LOCATORS["confirm_button"])).click()
-        self._wait_for_toast(self.MESSAGES["add_success"])
-        self._wait_for_row(group_name)
+        self._wait_for_toast(self.MESSAGES["add_success"], self._confirm("add"))
+        self.table.find_row(text=group_name)
 
     @retry_on_failure()
     def edit_group(self, original_name, new_name, new_description):
@@ -102,23 +128,26 @@ class ServiceGroupPage:
         self.wait.until(EC.visibility_of_element_located(self.LOCATORS["group_name_input"]))
         self._input_text(self.LOCATORS["group_name_input"], new_name)
         self._input_text(self.LOCATORS["description_input"], new_description)
-        self.wait.until(EC.element_to_be_clickable(self.LOCATORS["confirm_button"])).click()
-        self._wait_for_toast(self.MESSAGES["edit_success"])
-        self._wait_for_row(new_name)
+        self._wait_for_toast(self.MESSAGES["edit_success"], self._confirm("edit"))
+        self.table.find_row(text=new_name)
 
     @retry_on_failure()
     def delete_group(self, group_name):
         """Delete a service group."""
         self._click_action(group_name, "delete")
-        self.wait.until(EC.element_to_be_clickable(self.LOCATORS["confirm_button"])).click()
-        self._wait_for_toast(self.MESSAGES["delete_success"].format(group_name))
+        self._wait_for_toast(self.MESSAGES["delete_success"].format(group_name), self._confirm("delete"))
         self._wait_for_row(group_name, present=False)
 
     # Verification methods
-    def _verify_operation(self, message, row_name=None, should_exist=True):
-        """Verify operation success via toast or row state."""
+    def _verify_operation(self, operation, message, row_name=None, should_exist=True):
+        """Verify operation success via a toast shown after its confirm click, or via row state."""
+        since = self._marks.get(operation, 0)
+        if self.notifications.find(message, since=since):
+            return True
+        if row_name and self._row_in_snapshot(row_name) == should_exist:
+            return True
         try:
-            self._wait_for_toast(message, timeout=3)
+            self._wait_for_toast(message, since, timeout=3)
             return True
         except:
             if row_name:
@@ -131,20 +160,22 @@ class ServiceGroupPage:
 
     def verify_add_success(self):
         """Verify the success of adding a service group."""
-        return self._verify_operation(self.MESSAGES["add_success"])
+        return self._verify_operation("add", self.MESSAGES["add_success"])
 
     def verify_edit_success(self, new_name=None):
         """Verify the success of editing a service group."""
-        return self._verify_operation(self.MESSAGES["edit_success"], new_name)
+        return self._verify_operation("edit", self.MESSAGES["edit_success"], new_name)
 
     def verify_delete_success(self, group_name):
         """Verify the success of deleting a service group."""
-        return self._verify_operation(self.MESSAGES["delete_success"].format(group_name), group_name, False)
+        return self._verify_operation("delete", self.MESSAGES["delete_success"].format(group_name), group_name, False)
 
     def verify_group_in_table(self, group_name):
         """Verify if a group exists in the table."""
+        if self._row_in_snapshot(group_name):
+            return True
         try:
-            self._wait_for_row(group_name, timeout=5)
+            self.table.find_row(text=group_name)
             return True
         except:
             return False
\ No newline at end of file
@@ -0,0 +1,280 @@
+"""Component for reaching rows of large antd tables.
+
+Rows are looked up with one script per page (by data-row-key or exact cell
+text). When the row is not rendered, the component narrows the table with its
+search box (if any), jumps straight to a page already known from the in-run
+index, scrolls virtual tables in-page, and finally walks the pagination. Every
+page it scans is added to the index, so later lookups in the same run jump
+directly to the right page. Pages seen through the search filter are not
+indexed, and the filter is cleared before navigating the full table. After
+every page change the component waits for the previous rows to be replaced
+and the loading spinner to go, since antd marks the new page active before
+server-side data arrives.
+
+The index belongs to one table (its page object and root) and records the
+row keys plus, if the table names one, the text of a single column. Page
+objects that add or remove rows clear it, since rows shift between pages.
+"""
+
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
+
+from utils.wait import BrowserWait, ensure_script_timeout
+from utils import conditions as EC
+from utils.network import NetworkMonitor
+
+logger = logging.getLogger(__name__)
+
+# Scans the rendered rows; returns the matching <tr> (or null) and every row's key and text of the indexed column
+SCAN_SCRIPT = """
+    var root = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    var key = arguments[1], text = arguments[2], column = arguments[3], match = null, rows = [];
+    if (!root) { return {row: null, rows: rows, page: 1}; }
+    var active = root.querySelector('li.ant-pagination-item-active');
+    var normalize = function (el) { return el.textContent.replace(/\\s+/g, ' ').trim(); };
+    var columnIndex = column === null ? -1 : Array.prototype.map.call(root.querySelectorAll('thead th'), normalize).indexOf(column);
+    root.querySelectorAll('tr.ant-table-row').forEach(function (tr) {
+        var cells = Array.prototype.map.call(tr.querySelectorAll('td'), normalize);
+        var rowKey = tr.getAttribute('data-row-key');
+        rows.push([rowKey, columnIndex === -1 ? null : cells[columnIndex]]);
+        if (!match && ((key !== null && rowKey === String(key)) || (text !== null && cells.indexOf(text) !== -1))) { match = tr; }
+    });
+    return {row: match, rows: rows, page: active ? parseInt(active.getAttribute('title'), 10) : 1};
+"""
+
+# Optional elements are probed in-page so a missing one does not cost the implicit wait
+FIND_OPTIONAL_SCRIPT = """
+    return document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+"""
+
+# True once the table has no loading spinner and the first row captured before a page change is detached
+PAGE_SETTLED_SCRIPT = """
+    var root = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    var old = arguments[1];
+    if (!root || root.querySelector('.ant-spin-spinning')) { return false; }
+    return !old || !old.isConnected;
+"""
+
+# Scrolls a virtual table body step by step until the row is rendered or the end is reached
+VIRTUAL_SCAN_SCRIPT = """
+    var done = arguments[arguments.length - 1];
+    var root = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    var key = arguments[1], text = arguments[2];
+    var holder = root && root.querySelector('.ant-table-tbody-virtual-holder, .rc-virtual-list-holder, .ant-table-body');
+    if (!holder || holder.scrollHeight <= holder.clientHeight) { return done(null); }
+    function find() {
+        var rows = root.querySelectorAll('tr.ant-table-row, .ant-table-row');
+        for (var i = 0; i < rows.length; i++) {
+            var rowKey = rows[i].getAttribute('data-row-key');
+            if (key !== null && rowKey === String(key)) { return rows[i]; }
+            if (text !== null) {
+                var cells = rows[i].querySelectorAll('td, .ant-table-cell');
+                for (var j = 0; j < cells.length; j++) {
+                    if (cells[j].textContent.replace(/\\s+/g, ' ').trim() === text) { return rows[i]; }
+                }
+            }
+        }
+        return null;
+    }
+    holder.scrollTop = 0;
+    (function step() {
+        requestAnimationFrame(function () {
+            requestAnimationFrame(function () {
+                var row = find();
+                if (row) { row.scrollIntoView({block: 'center'}); return done(row); }
+                if (holder.scrollTop + holder.clientHeight >= holder.scrollHeight) { return done(null); }
+                holder.scrollTop += Math.max(holder.clientHeight - 40, 40);
+                step();
+            });
+        });
+    })();
+"""
+
+# (owner, table root) -> {("key", row key) or ("text", column text): page number}, kept for the run
+_page_index = {}
+
+
+class AntdTable:
+    """Navigates a (paginated or virtual) antd table to reach a row by key, text or position."""
+
+    def __init__(self, driver, owner, root_xpath="//div[contains(@class, 'ant-table-wrapper')]", search_locator=None,
+                 text_column=None, timeout=10):
+        """Initialize the table component.
+        Args:
+            driver: The WebDriver instance.
+            owner (str): Name of the page object holding the table; with root_xpath it identifies the table's index.
+            root_xpath (str): XPath of the table wrapper (pagination must be inside it).
+            search_locator (tuple): XPath locator of the table's search/filter input, if the page has one.
+            text_column (str): Header of the column whose text is indexed for text lookups; None indexes row keys only.
+            timeout (int): Seconds to wait for page changes.
+        """
+        self.driver = driver
+        self.root_xpath = root_xpath
+        self.search_locator = search_locator
+        self.text_column = text_column
+        self.timeout = timeout
+        self.wait = BrowserWait(driver, timeout)
+        self.network = NetworkMonitor(driver)
+        self.index = _page_index.setdefault((owner, root_xpath), {})
+        self._filtered = False
+
+        self.rows = (By.XPATH, f"{root_xpath}//tr[contains(@class, 'ant-table-row')]")
+        self.active_page = (By.XPATH, f"{root_xpath}//li[contains(@class, 'ant-pagination-item-active')]")
+        self.next_button = (By.XPATH, f"{root_xpath}//li[contains(@class, 'ant-pagination-next') and not(contains(@class, 'ant-pagination-disabled'))]")
+        self.quick_jumper = (By.XPATH, f"{root_xpath}//div[contains(@class, 'ant-pagination-options-quick-jumper')]//input")
+        self.page_item = f"{root_xpath}//li[contains(@class, 'ant-pagination-item') and @title='{{page}}']"
+
+    def _find_optional(self, locator):
+        """Return the first element matching an XPath locator, or None without waiting."""
+        return self.driver.execute_script(FIND_OPTIONAL_SCRIPT, locator[1])
+
+    def current_page(self):
+        """Return the active page number (1 for unpaginated tables)."""
+        item = self._find_optional(self.active_page)
+        return int(item.get_attribute("title")) if item else 1
+
+    def _wait_settled(self, old_row=None):
+        """Wait until old_row (a row of the previous view, if any) is replaced and no spinner shows.
+        Args:
+            old_row: First row before the change; None to wait for the spinner only.
+        """
+        self.wait.until(lambda d: d.execute_script(PAGE_SETTLED_SCRIPT, self.root_xpath, old_row),
+                        f"Table {self.root_xpath} did not finish loading")
+
+    def invalidate(self):
+        """Forget the indexed pages, after rows were added or removed."""
+        self.index.clear()
+
+    def _scan(self, key, text):
+        """Look for the row on the rendered page and record the rows seen in the index (unless filtered)."""
+        result = self.driver.execute_script(SCAN_SCRIPT, self.root_xpath, key, text, self.text_column)
+        if self._filtered:
+            return result["row"]
+        page = result["page"]
+        for row_key, column_text in result["rows"]:
+            if row_key is not None:
+                self.index[("key", row_key)] = page
+            if column_text:
+                self.index[("text", column_text)] = page
+        return result["row"]
+
+    def go_to_page(self, page):
+        """Jump to a page via the quick jumper or its page item, falling back to 'next' clicks."""
+        current = self.current_page()
+        if page == current:
+            return
+        old_row = self._find_optional(self.rows)
+        jumper = self._find_optional(self.quick_jumper)
+        item = self._find_optional((By.XPATH, self.page_item.format(page=page)))
+        if jumper:
+            jumper.send_keys(Keys.CONTROL + "a", str(page), Keys.ENTER)
+        elif item:
+            self.driver.execute_script("arguments[0].click();", item)
+        else:
+            for _ in range(page - current if page > current else 0):
+                self.driver.execute_script("arguments[0].click();", self.wait.until(EC.element_to_be_clickable(self.next_button)))
+        self.wait.until(EC.presence_of_element_located(
+            (By.XPATH, f"{self.active_page[1]}[@title='{page}']")))
+        self._wait_settled(old_row)
+
+    def _search(self, text):
+        """Filter the table with its search box, if it has one. Returns True if a search was made."""
+        if not self.search_locator:
+            return False
+        search = self._find_optional(self.search_locator)
+        if not search:
+            return False
+        search.send_keys(Keys.CONTROL + "a", Keys.DELETE, text, Keys.ENTER)
+        self._filtered = True
+        try:
+            self.wait.until(EC.text_to_be_present_in_element((By.XPATH, f"{self.root_xpath}//tbody"), text))
+            self._wait_settled()
+        except TimeoutException:
+            return False
+        return True
+
+    def _clear_search(self):
+        """Remove the search filter so pages and positions refer to the full table again."""
+        if not self._filtered:
+            return
+        search = self._find_optional(self.search_locator)
+        if search:
+            # Wait for the reload request itself; rows may be reused, so the DOM alone cannot tell it landed
+            since = self.network.mark()
+            search.send_keys(Keys.CONTROL + "a", Keys.DELETE, Keys.ENTER)
+            self.network.wait_since(since, "clear_search", timeout=self.timeout)
+            self._wait_settled()
+        self._filtered = False
+
+    def _scan_virtual(self, key, text):
+        ensure_script_timeout(self.driver, 30)
+        return self.driver.execute_async_script(VIRTUAL_SCAN_SCRIPT, self.root_xpath, key, text)
+
+    def find_row(self, key=None, text=None):
+        """Return the <tr> element with the given data-row-key or exact cell text, navigating as needed.
+        Args:
+            key (str): The data-row-key of the row.
+            text (str): Exact (whitespace-normalized) text of one of the row's cells.
+        Returns:
+            WebElement: The row element.
+        Raises:
+            TimeoutException: If the row cannot be found on any page.
+        """
+        if key is None and text is None:
+            raise ValueError("Either key or text is required.")
+        key = str(key) if key is not None else None
+        row = self._scan(key, text)
+        if row:
+            return row
+        if text is not None and self._search(text):
+            row = self._scan(key, text)
+            if row:
+                return row
+        self._clear_search()
+        known_page = self.index.get(("key", key) if key is not None else ("text", text))
+        if known_page and known_page != self.current_page():
+            self.go_to_page(known_page)
+            row = self._scan(key, text)
+            if row:
+                return row
+        row = self._scan_virtual(key, text)
+        if row:
+            return row
+        # Walk the pagination from page 1, indexing every page on the way
+        if self.current_page() != 1:
+            self.go_to_page(1)
+            row = self._scan(key, text)
+        while not row and self._find_optional(self.next_button):
+            self.go_to_page(self.current_page() + 1)
+            row = self._scan(key, text)
+        if not row:
+            raise TimeoutException(f"Row {key or text!r} not found in table {self.root_xpath}")
+        logger.info(f"Found row {key or text!r} on page {self.current_page()}")
+        return row
+
+    def row_at(self, position):
+        """Return the row at a 1-based position counted across pages.
+        Args:
+            position (int): Row number in the whole table.
+        Returns:
+            WebElement: The row element.
+        """
+        if position < 1:
+            raise ValueError("Row position must be positive.")
+        self._clear_search()
+        if self.current_page() != 1:
+            self.go_to_page(1)
+        self.wait.until(EC.presence_of_element_located(self.rows))
+        self._wait_settled()
+        rows = self.driver.find_elements(*self.rows)
+        page_size = len(rows)
+        if position <= page_size:
+            return rows[position - 1]
+        self.go_to_page((position - 1) // page_size + 1)
+        rows = self.driver.find_elements(*self.rows)
+        offset = (position - 1) % page_size
+        if offset >= len(rows):
+            raise TimeoutException(f"Table has fewer than {position} rows")
+        return rows[offset]
@@ -0,0 +1,45 @@
+"""Unit tests for the DOM snapshot model (no browser needed)."""
+
+from utils.dom_snapshot import Snapshot
+
+
+def _snapshot(raw_nodes):
+    return Snapshot("token:1", raw_nodes)
+
+
+def test_mixed_content_text_keeps_document_order():
+    """<td>Nhóm <b>Nhi</b> Khoa</td> reads as 'Nhóm Nhi Khoa', not own text first."""
+    snapshot = _snapshot([
+        ["tr", {}, ["", ""], -1],
+        ["td", {}, ["Nhóm ", " Khoa"], 0],
+        ["b", {}, ["Nhi"], 1],
+    ])
+    assert snapshot.find(tag="td").text == "Nhóm Nhi Khoa"
+    assert snapshot.exists(tag="td", text="Nhóm Nhi Khoa")
+    assert snapshot.find(tag="td").own_text == "Nhóm Khoa"
+
+
+def test_text_is_whitespace_normalized_across_children():
+    snapshot = _snapshot([
+        ["div", {}, ["\n  ", " ", "\n"], -1],
+        ["span", {}, ["Đã"], 0],
+        ["span", {}, ["thanh  toán"], 0],
+    ])
+    assert snapshot.root.text == "Đã thanh toán"
+
+
+def test_filters_on_class_and_attributes():
+    snapshot = _snapshot([
+        ["div", {"class": "ant-notification-notice ant-notification-notice-success"}, ["", ""], -1],
+        ["input", {"id": "height", "value": "170"}, [""], 0],
+    ])
+    assert snapshot.exists(css_class="ant-notification-notice-success")
+    assert not snapshot.exists(css_class="ant-notification")
+    assert snapshot.find(tag="input", attrs={"id": "height"}).attrs["value"] == "170"
+    assert snapshot.root.find(attrs={"id": "missing"}) is None
+
+
+def test_empty_snapshot_has_no_root():
+    snapshot = _snapshot([])
+    assert snapshot.root is None
+    assert not snapshot.exists(tag="td")
@@ -0,0 +1,86 @@
+"""Unit tests for duration-aware scheduling (no browser needed)."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils import scheduler
+
+
+def _result(name, start, stop, status="passed"):
+    return {"name": name, "titlePath": ["tests", "test_examination_process.py"],
+            "start": start, "stop": stop, "status": status}
+
+
+def test_nodeid_is_built_from_title_path():
+    result = _result("test_appointment_workflow[test_case0]", 0, 1)
+    assert scheduler._nodeid(result) == "tests/test_examination_process.py::test_appointment_workflow[test_case0]"
+    assert scheduler._nodeid({"name": "x", "titlePath": ["tests"]}) is None
+
+
+def test_build_index_takes_median_and_skips_skipped(tmp_path):
+    name = "test_appointment_workflow[test_case0]"
+    for i, (duration, status) in enumerate([(10, "passed"), (30, "failed"), (20, "passed"), (999, "skipped")]):
+        data = _result(name, 1000, 1000 + duration * 1000, status)
+        (tmp_path / f"{i}-result.json").write_text(json.dumps(data), encoding="utf-8")
+    assert scheduler.build_index(str(tmp_path)) == {f"tests/test_examination_process.py::{name}": 20}
+
+
+def test_estimator_falls_back_to_function_then_suite_median():
+    estimator = scheduler.DurationEstimator({"t.py::a[1]": 10.0, "t.py::a[2]": 30.0, "t.py::b[1]": 100.0})
+    assert estimator("t.py::a[1]") == 10.0
+    assert estimator("t.py::a[9]") == 20.0
+    assert estimator("t.py::c[1]") == 30.0
+    assert scheduler.DurationEstimator({})("t.py::a[1]") == scheduler.DEFAULT_DURATION
+
+
+def test_estimate_makespan_is_greedy_longest_first():
+    assert scheduler.estimate_makespan([7, 5, 4, 3, 1], 2) == 10
+    assert scheduler.estimate_makespan([], 3) == 0
+
+
+def test_deal_spreads_longest_items_one_per_node():
+    pairs = scheduler.deal(["l1", "l2", "l3", "l4", "l5", "l6", "l7"], ["gw0", "gw1", "gw2"])
+    assert pairs == [("gw0", "l1"), ("gw1", "l2"), ("gw2", "l3"), ("gw0", "l4"), ("gw1", "l5"), ("gw2", "l6")]
+    assert scheduler.deal(["l1"], ["gw0", "gw1"]) == [("gw0", "l1")]
+
+
+class FakeConfig:
+    def __init__(self, workers):
+        self.workers = workers
+
+    def getvalue(self, name):
+        return [f"{self.workers}*popen"] if name == "tx" else None
+
+    def getoption(self, name, default=None):
+        return default
+
+
+class FakeNode:
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def test_duration_scheduling_deals_sorted_queue_round_robin():
+    pytest.importorskip("xdist")
+    collection = [f"t.py::case[{i}]" for i in range(6)]
+    durations = {nodeid: float(i) for i, nodeid in enumerate(collection)}
+    sched = scheduler.DurationScheduling(FakeConfig(2), estimator=scheduler.DurationEstimator(durations))
+    nodes = [FakeNode("gw0"), FakeNode("gw1")]
+    for node in nodes:
+        sched.add_node(node)
+        sched.add_node_collection(node, collection)
+    sched.schedule()
+    # Longest is case[5]: gw0 gets 5 and 3, gw1 gets 4 and 2 -- never the two longest on one worker
+    assert nodes[0].sent == [5, 3]
+    assert nodes[1].sent == [4, 2]
+    assert sched.pending == [1, 0]
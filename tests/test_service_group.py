@@ -1,19 +1,21 @@
 """Test cases for Service Group functionality with data-driven testing."""
 
 import pytest
-import json
-from pages.login_page import LoginPage
-from pages.service_group_page import ServiceGroupPage
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-# Load test data from JSON file
-with open("data/service_group_data.json", "r", encoding="utf-8") as file:
-    test_data = json.load(file)["test_cases"]
-
-@pytest.mark.parametrize("test_case", test_data, ids=lambda x: f"test_id_{x['test_id']}")
-def test_add_edit_delete_service_group(driver, test_case):
+import os
+from utils.manifest import load_case
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_FILE = os.path.join(BASE_DIR, "data", "service_group_data.json")
+
+# Ids come from the pytest cache (utils.manifest); case data and page objects load only when a test runs
+@pytest.mark.cases(DATA_FILE, id_format="test_id_{test_id}")
+def test_add_edit_delete_service_group(driver, case_index):
     """Test the full lifecycle of adding, editing, and deleting a service group."""
+    from pages.login_page import LoginPage
+    from pages.service_group_page import ServiceGroupPage
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    test_case = load_case(DATA_FILE, case_index)
     test_id = test_case["test_id"]
     group_name = test_case["group_name"]
     description = test_case["description"]
@@ -0,0 +1,93 @@
+"""Unit tests for the workflow compiler and bindings (no browser needed)."""
+
+import os
+
+import pytest
+
+from utils import workflow
+
+
+class FakeExam:
+    ROW_FIELDS = ("morning", "note")
+    locators = {"prescription": {"doctor_advice": ("xpath", "//textarea[@id='advice']")}}
+
+    def enter_diagnosis(self, text):
+        pass
+
+    def open_prescription_tab(self):
+        pass
+
+    def is_exam_completed(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_pages(monkeypatch):
+    monkeypatch.setitem(workflow.PAGES, "exam", FakeExam)
+
+
+CASE = {"test_id": 7, "diagnosis": "Viêm họng", "vital_signs": {"height": 170}, "medicines": [{"name": "A"}]}
+
+
+def test_resolve_case_bindings_and_defaults():
+    assert workflow.resolve("$case.diagnosis", CASE) == "Viêm họng"
+    assert workflow.resolve("$case.vital_signs.height", CASE) == 170
+    assert workflow.resolve("$case.missing", CASE) is None
+    assert workflow.resolve({"$case": "missing.key", "default": {}}, CASE) == {}
+    assert workflow.resolve(["$case.test_id", {"x": "$case.diagnosis"}, 5], CASE) == [7, {"x": "Viêm họng"}, 5]
+    assert workflow.resolve("plain", CASE) == "plain"
+
+
+def test_resolve_file_binding_is_absolute_under_project_root():
+    path = workflow.resolve("$file:data/images/image_1.png", CASE)
+    assert path == os.path.join(workflow.BASE_DIR, "data", "images", "image_1.png")
+
+
+def test_compile_keeps_calls_and_restored_url_assertion():
+    plan = workflow.compile_workflow({"name": "t", "steps": [
+        {"wait_url_contains": "/examination/detail/"},
+        {"assert_url_contains": "/examination/detail/", "message": "Failed to reach exam page"},
+        {"call": "exam.enter_diagnosis", "args": ["$case.diagnosis"]},
+        {"assert": "exam.is_exam_completed", "message": "Exam not completed"},
+    ]})
+    assert [(op.kind, op.target) for op in plan.ops] == [
+        ("wait_url", "contains"), ("assert_url", "contains"), ("call", "enter_diagnosis"), ("assert", "is_exam_completed")]
+    assert plan.ops[1].message == "Failed to reach exam page"
+
+
+def test_compile_regroups_prescription_segments():
+    plan = workflow.compile_workflow({"steps": [
+        {"prescription": {"doctor_advice": "$case.diagnosis", "medicines": [{"name": "A", "fields": {"note": "x"}}]}},
+        {"prescription": {"medicines": {"$case": "medicines", "default": []}}},
+    ]})
+    assert [op.kind for op in plan.ops] == ["tab", "medicines", "fill"]
+    assert [group for group, _ in plan.ops[1].args] == [0, 1]
+    assert [entry[0] for entry in plan.ops[2].args] == ["locator", "rows", "rows"]
+
+
+def test_compile_keeps_main_form_fill_before_the_tab_click():
+    plan = workflow.compile_workflow({"steps": [
+        {"fill": "exam", "fields": {"vital_signs.height": "$case.vital_signs.height"}},
+        {"prescription": {"doctor_advice": "$case.diagnosis", "medicines": [{"name": "A"}]}},
+        {"fill": "exam", "fields": {"vital_signs.weight": 60}},
+    ]})
+    assert [(op.kind, op.tab) for op in plan.ops] == [
+        ("fill", None), ("tab", "open_prescription_tab"), ("medicines", "open_prescription_tab"),
+        ("fill", "open_prescription_tab"), ("fill", None)]
+    assert plan.ops[0].args == [("locator", "vital_signs.height", "$case.vital_signs.height")]
+    assert [entry[0] for entry in plan.ops[3].args] == ["locator", "rows"]
+    assert plan.ops[4].args == [("locator", "vital_signs.weight", 60)]
+
+
+def test_compile_rejects_unknown_row_fields():
+    with pytest.raises(ValueError, match="Unknown prescription row field"):
+        workflow.compile_workflow({"steps": [{"prescription": {"medicines": [{"name": "A", "fields": {"dose": 1}}]}}]})
+
+
+def test_compile_rejects_unknown_pages_methods_and_steps():
+    with pytest.raises(ValueError, match="Unknown page"):
+        workflow.compile_workflow({"steps": [{"call": "nope.method"}]})
+    with pytest.raises(ValueError, match="has no method"):
+        workflow.compile_workflow({"steps": [{"call": "exam.missing"}]})
+    with pytest.raises(ValueError, match="Unknown workflow step"):
+        workflow.compile_workflow({"steps": [{"bogus": 1}]})
@@ -0,0 +1,238 @@
+"""Compacted, streaming storage for Allure results.
+
+Opt-in with ALLURE_PACKED=1: when pytest then runs with --alluredir, results,
+containers and attachments are streamed into compressed zip segments under
+<alluredir>/runs/ instead of loose files (zip's central directory is the
+index). A segment is finalized every ALLURE_SEGMENT_SIZE results, so a crashed
+worker loses at most its open segment; open segments carry a .part suffix and
+are ignored by readers. Old runs, and .part segments left behind by crashed
+workers, are evicted at startup. The Allure CLI reads only the flat layout, so
+packed runs are expanded back into it before generating a report:
+
+    python -m utils.allure_store list
+    python -m utils.allure_store expand --runs 1 --out allure-results
+    allure/bin/allure generate allure-results --clean
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+
+import pytest
+import config.config as cfg
+
+try:
+    from allure_commons import hookimpl
+except ImportError:
+    def hookimpl(func):
+        return func
+
+logger = logging.getLogger(__name__)
+
+
+# Marks a directory as produced by expand(), so it may be replaced by the next expand
+EXPAND_MARKER = ".allure-store-expanded"
+# Seconds after its last write an open .part segment is taken as left by a crashed worker;
+# a live segment is written to as its tests finish, so this only needs to exceed a few test durations
+STALE_PART_AGE = 3600
+
+
+class PackedResultSink:
+    """allure-commons reporter that appends results to rotating zip segments of one run and worker."""
+
+    def __init__(self, prefix, segment_size=None):
+        """Args:
+            prefix (str): Path prefix of the segments (<archive_dir>/<run_id>-<worker>).
+            segment_size (int): Results per segment before it is finalized.
+        """
+        self.prefix = prefix
+        self.segment_size = segment_size or cfg.ALLURE_SEGMENT_SIZE
+        self._lock = threading.Lock()
+        self._segment = 0
+        self._results = 0
+        self._zip = None
+        self._open_segment()
+
+    def _open_segment(self):
+        self._segment += 1
+        self._results = 0
+        self.path = f"{self.prefix}-{self._segment:04d}.zip"
+        self._zip = zipfile.ZipFile(self.path + ".part", "w", compression=zipfile.ZIP_DEFLATED)
+
+    def _finalize_segment(self):
+        self._zip.close()
+        os.replace(self.path + ".part", self.path)
+
+    def _write(self, name, data, result=False):
+        with self._lock:
+            self._zip.writestr(name, data)
+            if result:
+                self._results += 1
+                if self._results >= self.segment_size:
+                    self._finalize_segment()
+                    self._open_segment()
+
+    def _write_item(self, item, result=False):
+        from attr import asdict
+        data = asdict(item, filter=lambda attribute, value: not (type(value) != bool and not bool(value)))
+        self._write(item.file_pattern.format(prefix=uuid.uuid4()), json.dumps(data, ensure_ascii=False), result)
+
+    @hookimpl
+    def report_result(self, result):
+        self._write_item(result, result=True)
+
+    @hookimpl
+    def report_container(self, container):
+        self._write_item(container)
+
+    @hookimpl
+    def report_attached_file(self, source, file_name):
+        with open(source, "rb") as file:
+            self._write(file_name, file.read())
+
+    @hookimpl
+    def report_attached_data(self, body, file_name):
+        self._write(file_name, body if isinstance(body, bytes) else body.encode("utf-8"))
+
+    def close(self):
+        with self._lock:
+            if self._zip.namelist():
+                self._finalize_segment()
+            else:
+                self._zip.close()
+                os.remove(self.path + ".part")
+
+
+def list_runs(archive_dir):
+    """Return [(run_id, [finalized segment paths])] ordered newest first."""
+    runs = {}
+    if os.path.isdir(archive_dir):
+        for name in os.listdir(archive_dir):
+            if name.endswith(".zip"):
+                runs.setdefault(name.split("-", 1)[0], []).append(os.path.join(archive_dir, name))
+    return sorted(runs.items(), key=lambda run: max(os.path.getmtime(p) for p in run[1]), reverse=True)
+
+
+def evict_runs(archive_dir, keep, now=None):
+    """Delete all but the newest `keep` runs, and stale .part segments of crashed workers."""
+    for run_id, paths in list_runs(archive_dir)[keep:]:
+        for path in paths:
+            os.remove(path)
+        logger.info(f"Evicted Allure run {run_id}")
+    if not os.path.isdir(archive_dir):
+        return
+    now = time.time() if now is None else now
+    for entry in os.scandir(archive_dir):
+        if entry.name.endswith(".zip.part") and now - entry.stat().st_mtime > STALE_PART_AGE:
+            os.remove(entry.path)
+            logger.info(f"Removed stale Allure segment {entry.name}")
+
+
+def iter_entries(archive_dir, suffix):
+    """Yield (name, bytes) of archived entries whose name ends with suffix."""
+    for _, paths in list_runs(archive_dir):
+        for path in paths:
+            try:
+                with zipfile.ZipFile(path) as archive:
+                    for name in archive.namelist():
+                        if name.endswith(suffix):
+                            yield name, archive.read(name)
+            except zipfile.BadZipFile:
+                logger.warning(f"Skipping unreadable Allure archive {path}")
+
+
+def expand(archive_dir, out_dir, runs=None):
+    """Extract the newest `runs` runs (all if None) into a flat Allure results directory.
+
+    Raises:
+        ValueError: If out_dir contains the archives, or is a non-empty directory
+            that was not produced by a previous expand.
+    """
+    out_real, archive_real = os.path.realpath(out_dir), os.path.realpath(archive_dir)
+    if os.path.commonpath([out_real, archive_real]) == out_real:
+        raise ValueError(f"Refusing to expand into {out_dir}: it contains the archives in {archive_dir}")
+    if os.path.isdir(out_dir) and os.listdir(out_dir):
+        if not os.path.exists(os.path.join(out_dir, EXPAND_MARKER)):
+            raise ValueError(f"Refusing to replace {out_dir}: not empty and not a previous expand output")
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    open(os.path.join(out_dir, EXPAND_MARKER), "w").close()
+    for _, paths in list_runs(archive_dir)[:runs]:
+        for path in paths:
+            with zipfile.ZipFile(path) as archive:
+                archive.extractall(out_dir)
+    return out_dir
+
+
+_sink = None
+# allure-pytest's file loggers taken off the plugin manager; put back before its own cleanup unregisters them
+_displaced = []
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    """Replace allure-pytest's loose-file logger with the packed sink."""
+    global _sink
+    report_dir = getattr(config.option, "allure_report_dir", None)
+    if not report_dir or not cfg.ALLURE_PACKED:
+        return
+    try:
+        from allure_commons import plugin_manager
+        from allure_commons.logger import AllureFileLogger
+    except ImportError:
+        return
+    archive_dir = os.path.join(report_dir, "runs")
+    os.makedirs(archive_dir, exist_ok=True)
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None:
+        evict_runs(archive_dir, cfg.ALLURE_KEEP_RUNS - 1)
+        if config.getoption("numprocesses", None):
+            # xdist controller: workers report the results
+            return
+    run_id = workerinput["testrunuid"] if workerinput else uuid.uuid4().hex
+    worker = workerinput["workerid"] if workerinput else "master"
+    for plugin in plugin_manager.get_plugins():
+        if isinstance(plugin, AllureFileLogger):
+            plugin_manager.unregister(plugin)
+            _displaced.append(plugin)
+    _sink = PackedResultSink(os.path.join(archive_dir, f"{run_id}-{worker}"))
+    plugin_manager.register(_sink)
+
+
+def pytest_unconfigure(config):
+    """Finalize the open segment and restore the file loggers allure-pytest expects to unregister."""
+    global _sink
+    if _sink:
+        from allure_commons import plugin_manager
+        plugin_manager.unregister(_sink)
+        _sink.close()
+        _sink = None
+        while _displaced:
+            plugin_manager.register(_displaced.pop())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage packed Allure results.")
+    parser.add_argument("command", choices=["list", "expand"])
+    parser.add_argument("--dir", default=os.path.join(cfg.REPORTS_DIR, "runs"), help="Archive directory")
+    parser.add_argument("--out", default="allure-results", help="Output directory for expand")
+    parser.add_argument("--runs", type=int, default=None, help="Number of newest runs to expand (default: all)")
+    args = parser.parse_args()
+    if args.command == "list":
+        for run_id, paths in list_runs(args.dir):
+            print(run_id, len(paths), "archive(s)", sum(os.path.getsize(p) for p in paths), "bytes")
+    else:
+        try:
+            print(expand(args.dir, args.out, args.runs))
+        except ValueError as e:
+            parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Expected conditions that can be evaluated inside the browser.
+
+Drop-in replacements for the `expected_conditions` used by the page objects.
+Each condition is still a plain callable, so it works with WebDriverWait, but
+it also describes itself (kind, locator, argument) so BrowserWait can compile
+it into a single in-page script instead of polling over WebDriver.
+"""
+
+from selenium.webdriver.support import expected_conditions as _ec
+
+
+class BrowserCondition:
+    """A callable expected condition with an in-page description."""
+
+    def __init__(self, kind, locator=None, arg=None, fallback=None):
+        self.kind = kind
+        self.locator = locator
+        self.arg = arg
+        self.fallback = fallback
+
+    def __call__(self, driver):
+        return self.fallback(driver)
+
+    def __repr__(self):
+        return f"{self.kind}({self.locator or ''}{', ' + repr(self.arg) if self.arg is not None else ''})"
+
+
+def presence_of_element_located(locator):
+    return BrowserCondition("presence", locator, fallback=_ec.presence_of_element_located(locator))
+
+
+def visibility_of_element_located(locator):
+    return BrowserCondition("visible", locator, fallback=_ec.visibility_of_element_located(locator))
+
+
+def invisibility_of_element_located(locator):
+    return BrowserCondition("invisible", locator, fallback=_ec.invisibility_of_element_located(locator))
+
+
+def element_to_be_clickable(locator):
+    return BrowserCondition("clickable", locator, fallback=_ec.element_to_be_clickable(locator))
+
+
+def text_to_be_present_in_element(locator, text):
+    return BrowserCondition("text", locator, text, fallback=_ec.text_to_be_present_in_element(locator, text))
+
+
+def url_contains(url):
+    return BrowserCondition("url_contains", arg=url, fallback=_ec.url_contains(url))
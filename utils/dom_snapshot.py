@@ -0,0 +1,173 @@
+"""Serialized DOM snapshots for read-only verifications.
+
+A snapshot pulls a DOM subtree in one script call and answers text/attribute
+checks in Python. A MutationObserver installed in the page (plus input/change
+listeners, since typing does not mutate attributes) bumps a generation counter
+on every change; the counter carries a per-document token so a navigation
+never matches an old generation. While the generation is unchanged the cached
+snapshot is reused, so a burst of checks costs a single round-trip.
+"""
+
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SCRIPT = """
+    if (!window.__domSnapshot) {
+        var state = window.__domSnapshot = {token: Math.random().toString(36).slice(2), count: 1};
+        var bump = function () { state.count++; };
+        new MutationObserver(bump)
+            .observe(document.documentElement, {subtree: true, childList: true, attributes: true, characterData: true});
+        document.addEventListener('input', bump, true);
+        document.addEventListener('change', bump, true);
+    }
+    var generation = window.__domSnapshot.token + ':' + window.__domSnapshot.count;
+    if (arguments[1] === generation) { return {generation: generation, nodes: null}; }
+    var root = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    var nodes = [];
+    if (!root) { return {generation: generation, nodes: nodes}; }
+    (function walk(el, parent) {
+        var attrs = {};
+        for (var i = 0; i < el.attributes.length; i++) { attrs[el.attributes[i].name] = el.attributes[i].value; }
+        if (typeof el.value === 'string') { attrs.value = el.value; }
+        // Text runs around the element children: runs[i] precedes children[i], the last run follows them
+        var runs = [''];
+        for (var c = el.firstChild; c; c = c.nextSibling) {
+            if (c.nodeType === 3) { runs[runs.length - 1] += c.nodeValue; } else if (c.nodeType === 1) { runs.push(''); }
+        }
+        var index = nodes.length;
+        nodes.push([el.tagName.toLowerCase(), attrs, runs, parent]);
+        for (var k = 0; k < el.children.length; k++) { walk(el.children[k], index); }
+    })(root, -1);
+    return {generation: generation, nodes: nodes};
+"""
+
+
+def _normalize(text):
+    """Collapse whitespace like XPath normalize-space()."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class Node:
+    """An element of a DOM snapshot."""
+
+    def __init__(self, tag, attrs, text_runs, parent):
+        """Args:
+            tag (str): Lower-case tag name.
+            attrs (dict): Attributes (plus the live value of form fields).
+            text_runs (list): Direct text around the element children; run i precedes
+                child i and the last run follows the last child.
+            parent (Node): Parent element, or None for the root.
+        """
+        self.tag = tag
+        self.attrs = attrs
+        self.own_text = _normalize("".join(text_runs))
+        self.parent = parent
+        self.children = []
+        self._runs = text_runs
+        self._text = None
+
+    @property
+    def text(self):
+        """Normalized text of the element and its descendants."""
+        if self._text is None:
+            self._text = _normalize(self._full_text())
+        return self._text
+
+    def _full_text(self):
+        """Raw text in document order, interleaving own text runs with the children's text."""
+        parts = [self._runs[0]]
+        for child, run in zip(self.children, self._runs[1:]):
+            parts.append(child._full_text())
+            parts.append(run)
+        return "".join(parts)
+
+    def has_class(self, name):
+        """Check whether the class attribute contains the given class name."""
+        return name in self.attrs.get("class", "").split()
+
+    def matches(self, tag=None, css_class=None, text=None, text_contains=None, attrs=None):
+        """Check the element against the given filters; None means 'any'."""
+        if tag and self.tag != tag:
+            return False
+        if css_class and not self.has_class(css_class):
+            return False
+        if text is not None and self.text != text:
+            return False
+        if text_contains is not None and text_contains not in self.text:
+            return False
+        for name, value in (attrs or {}).items():
+            if self.attrs.get(name) != value:
+                return False
+        return True
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.descendants()
+
+    def find_all(self, **filters):
+        """Return descendants matching the filters (see matches)."""
+        return [node for node in self.descendants() if node.matches(**filters)]
+
+    def find(self, **filters):
+        """Return the first descendant matching the filters, or None."""
+        return next((node for node in self.descendants() if node.matches(**filters)), None)
+
+
+class Snapshot:
+    """A parsed snapshot of one DOM subtree."""
+
+    def __init__(self, generation, raw_nodes):
+        self.generation = generation
+        self.nodes = []
+        for tag, attrs, text_runs, parent in raw_nodes:
+            node = Node(tag, attrs, text_runs, self.nodes[parent] if parent >= 0 else None)
+            if node.parent:
+                node.parent.children.append(node)
+            self.nodes.append(node)
+
+    @property
+    def root(self):
+        return self.nodes[0] if self.nodes else None
+
+    def find_all(self, **filters):
+        """Return all elements (root included) matching the filters."""
+        return [node for node in self.nodes if node.matches(**filters)]
+
+    def find(self, **filters):
+        """Return the first element matching the filters, or None."""
+        return next((node for node in self.nodes if node.matches(**filters)), None)
+
+    def exists(self, **filters):
+        """Check whether any element matches the filters."""
+        return self.find(**filters) is not None
+
+
+class DomSnapshot:
+    """Caches serialized DOM subtrees per root until the page mutates."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._cache = {}
+
+    def get(self, root_xpath="//body"):
+        """Return a snapshot of the subtree at root_xpath, refreshed only if the DOM changed.
+        Args:
+            root_xpath (str): XPath of the subtree root.
+        Returns:
+            Snapshot: The current snapshot.
+        """
+        cached = self._cache.get(root_xpath)
+        result = self.driver.execute_script(SNAPSHOT_SCRIPT, root_xpath, cached.generation if cached else None)
+        if result["nodes"] is None:
+            return cached
+        snapshot = Snapshot(result["generation"], result["nodes"])
+        self._cache[root_xpath] = snapshot
+        logger.debug(f"DOM snapshot of {root_xpath}: {len(snapshot.nodes)} nodes (generation {snapshot.generation})")
+        return snapshot
+
+    def invalidate(self):
+        """Drop all cached snapshots."""
+        self._cache.clear()
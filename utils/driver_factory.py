@@ -1,6 +1,167 @@
-"""Utility to create WebDriver instances based on browser type."""
+"""Utility to create WebDriver instances based on browser type.
+
+One chromedriver/geckodriver process is started per worker and kept running
+(and restarted if it dies); each test only opens a new session against it
+through a shared keep-alive connection pool that survives quit(). Driver
+binaries are resolved once and the lookup is cached on disk so later workers
+and runs skip driver discovery; the entry is dropped when the cached driver no
+longer matches the installed browser.
+"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
 
 from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.firefox.remote_connection import FirefoxRemoteConnection
+from selenium.webdriver.remote.command import Command
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+import config.config as cfg
+
+logger = logging.getLogger(__name__)
+
+# Running driver services and their pooled connections, per browser (one set per worker process)
+_services = {}
+
+
+class LocalSession(webdriver.Remote):
+    """Remote session on a driver service of this machine.
+
+    The browser shares the local file system, so file inputs get plain paths
+    (no zip/upload round trip), and quit() leaves the shared connection pool open.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._is_remote = False
+
+    def quit(self):
+        """End the session only; the connection belongs to the worker's service."""
+        try:
+            self.execute(Command.QUIT)
+        finally:
+            self.stop_client()
+
+
+class ChromeSession(LocalSession):
+    """Local session on the shared chromedriver service, keeping Chrome's CDP entry point."""
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """Execute a Chrome DevTools Protocol command and return its result."""
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+
+def _load_driver_cache():
+    try:
+        with open(cfg.DRIVER_CACHE, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_driver_cache(cache):
+    """Write the cache atomically so parallel workers never read a partial file."""
+    directory = os.path.dirname(cfg.DRIVER_CACHE)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        json.dump(cache, file)
+    os.replace(tmp_path, cfg.DRIVER_CACHE)
+
+
+def forget_driver_path(browser):
+    """Drop a browser's cached driver path, e.g. after the browser was updated."""
+    cache = _load_driver_cache()
+    if cache.pop(browser, None):
+        _save_driver_cache(cache)
+        logger.info(f"Dropped cached {browser} driver path")
+
+
+def resolve_driver_path(browser):
+    """Return the driver binary path for a browser, using the on-disk cache when valid.
+
+    Args:
+        browser (str): "chrome" or "firefox".
+
+    Returns:
+        str: Path to the driver binary, or None to let Selenium Manager resolve it.
+    """
+    cache = _load_driver_cache()
+    path = cache.get(browser)
+    if path and os.path.isfile(path):
+        return path
+    try:
+        if browser == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+        else:
+            from webdriver_manager.firefox import GeckoDriverManager
+            path = GeckoDriverManager().install()
+    except ImportError:
+        return None
+    cache[browser] = path
+    _save_driver_cache(cache)
+    logger.info(f"Resolved {browser} driver: {path}")
+    return path
+
+
+def get_service(browser="chrome"):
+    """Return the running driver service and its keep-alive connection, starting them once.
+
+    Args:
+        browser (str): "chrome" or "firefox".
+
+    Returns:
+        tuple: (service, remote_connection).
+    """
+    if browser in _services and not _is_alive(_services[browser][0]):
+        logger.warning(f"{browser} driver service is not responding; restarting it")
+        stop_service(browser)
+    if browser not in _services:
+        path = resolve_driver_path(browser)
+        if browser == "chrome":
+            service = ChromeService(executable_path=path) if path else ChromeService()
+            service.start()
+            connection = ChromiumRemoteConnection(remote_server_addr=service.service_url, vendor_prefix="goog",
+                                                  browser_name="chrome", keep_alive=True)
+        else:
+            service = FirefoxService(executable_path=path) if path else FirefoxService()
+            service.start()
+            connection = FirefoxRemoteConnection(remote_server_addr=service.service_url, keep_alive=True)
+        atexit.register(service.stop)
+        logger.info(f"Started {browser} driver service at {service.service_url}")
+        _services[browser] = (service, connection)
+    return _services[browser]
+
+
+def _is_alive(service):
+    try:
+        service.assert_process_still_running()
+    except WebDriverException:
+        return False
+    return service.is_connectable()
+
+
+def stop_service(browser):
+    """Stop one browser's driver service and close its connection pool."""
+    service, connection = _services.pop(browser)
+    connection.close()
+    try:
+        service.stop()
+    except Exception as e:
+        logger.debug(f"Stopping {browser} driver service failed: {e}")
+
+
+def stop_services():
+    """Stop all driver services started by this process."""
+    for browser in list(_services):
+        stop_service(browser)
+
 
 def get_driver(browser="chrome"):
     """Create and return a WebDriver instance for the specified browser.
@@ -14,14 +175,25 @@ def get_driver(browser="chrome"):
     Raises:
         ValueError: If an unsupported browser is specified.
     """
+    browser = browser.lower()
+    if browser == "chrome":
+        options = webdriver.ChromeOptions()
+    elif browser == "firefox":
+        options = webdriver.FirefoxOptions()
+    else:
+        raise ValueError(f"Unsupported browser: {browser}")
+    session_class = ChromeSession if browser == "chrome" else LocalSession
+    service, connection = get_service(browser)
     try:
-        if browser.lower() == "chrome":
-            driver = webdriver.Chrome()
-        elif browser.lower() == "firefox":
-            driver = webdriver.Firefox()
-        else:
-            raise ValueError(f"Unsupported browser: {browser}")
-        driver.maximize_window()
-        return driver
-    except Exception as e:
-        raise
\ No newline at end of file
+        driver = session_class(command_executor=connection, options=options)
+    except SessionNotCreatedException:
+        # Usually a cached driver that no longer matches an auto-updated browser: resolve again once
+        logger.warning(f"Could not create a {browser} session; re-resolving the driver")
+        forget_driver_path(browser)
+        stop_service(browser)
+        service, connection = get_service(browser)
+        driver = session_class(command_executor=connection, options=options)
+    # Sessions share the service; quit() ends the session but leaves the driver process running
+    driver.service = service
+    driver.maximize_window()
+    return driver
@@ -0,0 +1,190 @@
+"""Structured, parallel-safe logging for test runs.
+
+The root logger only gets a QueueHandler, so emitting a record is a
+non-blocking enqueue; a QueueListener thread formats records as JSON lines
+and writes them to one file per xdist worker and one file per test. Every
+record is tagged with the worker id, the current test id and workflow step.
+"""
+
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+
+WORKER_ID = os.getenv("PYTEST_XDIST_WORKER", "master")
+
+_test_id = contextvars.ContextVar("test_id", default=None)
+_step = contextvars.ContextVar("step", default=None)
+
+_listener = None
+_test_handler = None
+
+
+class ContextFilter(logging.Filter):
+    """Attach worker, test and step to each record at emit time (in the calling thread)."""
+
+    def filter(self, record):
+        record.worker = WORKER_ID
+        record.test_id = _test_id.get()
+        record.step = _step.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "worker": getattr(record, "worker", WORKER_ID),
+            "test": getattr(record, "test_id", None),
+            "step": getattr(record, "step", None),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback in its own field.
+
+    The base prepare() merges the formatted traceback into the message and
+    drops exc_info; here the traceback is rendered in the calling thread into
+    exc_text and the message stays clean.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class PerTestFileHandler(logging.Handler):
+    """Write records of the running test to its own file; runs on the listener thread."""
+
+    def __init__(self):
+        super().__init__()
+        self._files = {}
+
+    def open(self, test_id, path):
+        # A re-run replaces the previous run's log, so only this run is attached to its result
+        self._files[test_id] = open(path, "w", encoding="utf-8")
+
+    def emit(self, record):
+        marker = getattr(record, "flush_event", None)
+        if marker is not None:
+            stream = self._files.get(record.test_id)
+            if stream:
+                stream.flush()
+            marker.set()
+            return
+        marker = getattr(record, "close_event", None)
+        if marker is not None:
+            stream = self._files.pop(record.test_id, None)
+            if stream:
+                stream.close()
+            marker.set()
+            return
+        stream = self._files.get(getattr(record, "test_id", None))
+        if stream:
+            stream.write(self.format(record) + "\n")
+
+    def close(self):
+        for stream in self._files.values():
+            stream.close()
+        self._files.clear()
+        super().close()
+
+
+def setup_logging(log_dir="logs", level=logging.INFO):
+    """Route all logging through a queue to per-worker and per-test JSON files.
+    Args:
+        log_dir (str): Directory for log files.
+        level (int): Root logger level.
+    """
+    global _listener, _test_handler
+    if _listener:
+        return
+    os.makedirs(os.path.join(log_dir, "tests"), exist_ok=True)
+    formatter = JsonFormatter()
+
+    worker_handler = logging.FileHandler(os.path.join(log_dir, f"{WORKER_ID}.log"), encoding="utf-8")
+    worker_handler.setFormatter(formatter)
+    worker_handler.addFilter(lambda record: not hasattr(record, "close_event") and not hasattr(record, "flush_event"))
+    _test_handler = PerTestFileHandler()
+    _test_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, worker_handler, _test_handler)
+    _listener.queue_handler = queue_handler
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush pending records and stop the listener thread."""
+    global _listener
+    if not _listener:
+        return
+    logging.getLogger().removeHandler(_listener.queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def start_test_log(test_id, log_dir="logs"):
+    """Tag subsequent records with test_id and start its log file.
+    Returns:
+        str: Path of the per-test log file.
+    """
+    path = os.path.join(log_dir, "tests", re.sub(r"[^\w.-]+", "_", test_id) + ".log")
+    if _test_handler:
+        _test_handler.open(test_id, path)
+    _test_id.set(test_id)
+    return path
+
+
+def stop_test_log(timeout=5):
+    """Close the running test's log file once every record queued before this call is written."""
+    test_id = _test_id.get()
+    _test_id.set(None)
+    _step.set(None)
+    if not _listener or test_id is None:
+        return
+    marker = logging.makeLogRecord({"test_id": test_id, "close_event": threading.Event()})
+    _listener.queue.put_nowait(marker)
+    marker.close_event.wait(timeout)
+
+
+def flush_test_log(test_id, timeout=5):
+    """Write out every record of test_id queued before this call, keeping its log file open."""
+    if not _listener:
+        return
+    marker = logging.makeLogRecord({"test_id": test_id, "flush_event": threading.Event()})
+    _listener.queue.put_nowait(marker)
+    marker.flush_event.wait(timeout)
+
+
+def set_step(step):
+    """Tag subsequent records with the current workflow step."""
+    _step.set(step)
@@ -0,0 +1,81 @@
+"""Cached ids of data-driven test cases.
+
+Tests marked @pytest.mark.cases(path, id_format=..., key=...) are parametrized
+over the `case_index` argument, with ids kept in the pytest cache
+(config.cache) instead of parsing every data file on every worker. A data
+file's entry is reused while its mtime/size are unchanged and, when they
+change, while its content hash still matches; only then is the file parsed
+again. Without the cache provider (-p no:cacheprovider) the file is parsed each
+time. Case data is loaded lazily, when a test actually runs.
+"""
+
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_PREFIX = "clinic/cases"
+
+
+def _format_id(id_format, index, case):
+    # Fields go through format_map so a case field named "index" cannot clash with the position;
+    # the position takes precedence
+    return id_format.format_map({**case, "index": index})
+
+
+def case_ids(config, path, id_format="test_case{index}", key="test_cases"):
+    """Return the parametrize ids of the cases in a data file, from the pytest cache when current.
+
+    Args:
+        config: The pytest config (its cache, if the cache provider is enabled, holds the ids).
+        path (str): JSON data file holding a list of cases under `key`.
+        id_format (str): Format of each id; receives the case's fields and `index`, its position.
+        key (str): Top-level key of the case list.
+
+    Returns:
+        list: One id per case, in file order.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cache = getattr(config, "cache", None)
+    # Cache keys become file names, so keep them to portable characters
+    cache_key = f"{CACHE_PREFIX}/" + re.sub(r"[^\w.-]+", "_", f"{os.path.relpath(path, BASE_DIR)}:{key}:{id_format}")
+    entry = cache.get(cache_key, None) if cache else None
+    if entry and [entry["mtime"], entry["size"]] == [stat.st_mtime, stat.st_size]:
+        return entry["ids"]
+    with open(path, "rb") as file:
+        content = file.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if not entry or entry["sha256"] != digest:
+        cases = json.loads(content.decode("utf-8"))[key]
+        entry = {"sha256": digest, "ids": [_format_id(id_format, index, case) for index, case in enumerate(cases)]}
+    entry.update(mtime=stat.st_mtime, size=stat.st_size)
+    if cache:
+        cache.set(cache_key, entry)
+    return entry["ids"]
+
+
+@lru_cache(maxsize=None)
+def _load_cases(path, key):
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)[key]
+
+
+def load_case(path, index, key="test_cases"):
+    """Load one case from a data file; the file is parsed once per process, on first use."""
+    return _load_cases(os.path.abspath(path), key)[index]
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "cases(path, id_format, key): parametrize case_index over the cases of a data file")
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize `case_index` of tests marked with @pytest.mark.cases."""
+    marker = metafunc.definition.get_closest_marker("cases")
+    if marker is None or "case_index" not in metafunc.fixturenames:
+        return
+    ids = case_ids(metafunc.config, *marker.args, **marker.kwargs)
+    metafunc.parametrize("case_index", range(len(ids)), ids=ids)
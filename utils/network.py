@@ -0,0 +1,194 @@
+"""Network-aware action helpers.
+
+The page's fetch and XMLHttpRequest are wrapped so every backend request is
+recorded (method, url, status, latency). An action can then click and return
+as soon as the matching request completes, in a single async script call,
+instead of relying on later UI polling to notice the server answered.
+"""
+
+import logging
+from utils.wait import ensure_script_timeout
+
+logger = logging.getLogger(__name__)
+
+MUTATING_METHODS = ["POST", "PUT", "PATCH", "DELETE"]
+
+
+class BackendRequestError(Exception):
+    """The request behind an action failed or never completed after the click.
+
+    The click may already have reached the server, so repeating the action
+    could send a duplicate mutation; retry_on_failure re-raises it immediately.
+    """
+
+    retryable = False
+
+INSTALL_SCRIPT = """
+    (function () {
+        if (window.__network) { return; }
+        var state = window.__network = {seq: 0, listeners: [], recent: []};
+        function finish(entry, status) {
+            entry.status = status;
+            entry.duration = Math.round(performance.now() - entry.started);
+            // Kept briefly so a request that finished before a waiter attached is not missed
+            state.recent.push(entry);
+            if (state.recent.length > 50) { state.recent.shift(); }
+            state.listeners.slice().forEach(function (listener) { listener(entry); });
+        }
+        function start(method, url) {
+            return {seq: ++state.seq, method: (method || 'GET').toUpperCase(), url: String(url), started: performance.now()};
+        }
+        var originalFetch = window.fetch;
+        if (originalFetch) {
+            window.fetch = function (input, init) {
+                var entry = start((init && init.method) || (input && input.method), (input && input.url) || input);
+                return originalFetch.apply(this, arguments).then(function (response) {
+                    finish(entry, response.status);
+                    return response;
+                }, function (error) {
+                    finish(entry, 0);
+                    throw error;
+                });
+            };
+        }
+        var open = XMLHttpRequest.prototype.open, send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.open = function (method, url) {
+            this.__method = method;
+            this.__url = url;
+            return open.apply(this, arguments);
+        };
+        XMLHttpRequest.prototype.send = function () {
+            var xhr = this, entry = start(xhr.__method, xhr.__url);
+            xhr.addEventListener('loadend', function () { finish(entry, xhr.status); });
+            return send.apply(this, arguments);
+        };
+    })();
+"""
+
+CLICK_AND_WAIT_SCRIPT = """
+    var done = arguments[arguments.length - 1];
+    var element = arguments[0], pattern = arguments[1] ? new RegExp(arguments[1]) : null;
+    var methods = arguments[2], timeout = arguments[3];
+    var state = window.__network, since = state.seq, timer;
+    var listener = function (entry) {
+        if (entry.seq <= since || (methods && methods.indexOf(entry.method) === -1) || (pattern && !pattern.test(entry.url))) {
+            return;
+        }
+        clearTimeout(timer);
+        state.listeners.splice(state.listeners.indexOf(listener), 1);
+        done({method: entry.method, url: entry.url, status: entry.status, duration: entry.duration});
+    };
+    timer = setTimeout(function () {
+        state.listeners.splice(state.listeners.indexOf(listener), 1);
+        done(null);
+    }, timeout);
+    state.listeners.push(listener);
+    element.click();
+"""
+
+# Waits for the first matching request started after sequence number arguments[0]
+WAIT_SINCE_SCRIPT = """
+    var done = arguments[arguments.length - 1];
+    var since = arguments[0], pattern = arguments[1] ? new RegExp(arguments[1]) : null;
+    var methods = arguments[2], timeout = arguments[3];
+    var state = window.__network, timer;
+    function matches(entry) {
+        return entry.seq > since && (!methods || methods.indexOf(entry.method) !== -1) && (!pattern || pattern.test(entry.url));
+    }
+    function report(entry) {
+        return {method: entry.method, url: entry.url, status: entry.status, duration: entry.duration};
+    }
+    var finished = state.recent.filter(matches)[0];
+    if (finished) { return done(report(finished)); }
+    var listener = function (entry) {
+        if (!matches(entry)) { return; }
+        clearTimeout(timer);
+        state.listeners.splice(state.listeners.indexOf(listener), 1);
+        done(report(entry));
+    };
+    timer = setTimeout(function () {
+        state.listeners.splice(state.listeners.indexOf(listener), 1);
+        done(null);
+    }, timeout);
+    state.listeners.push(listener);
+"""
+
+
+class NetworkMonitor:
+    """Clicks elements and waits for the backend request they trigger."""
+
+    def __init__(self, driver):
+        """Install the fetch/XHR hooks in the current page (idempotent).
+        Args:
+            driver: The WebDriver instance.
+        """
+        self.driver = driver
+        # Shared by all page objects of the session, so the driver fixture can report them per test
+        if not hasattr(driver, "network_timings"):
+            driver.network_timings = []
+        self.timings = driver.network_timings
+        if hasattr(driver, "execute_cdp_cmd") and not getattr(driver, "_network_monitor", False):
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INSTALL_SCRIPT})
+            driver._network_monitor = True
+        driver.execute_script(INSTALL_SCRIPT)
+
+    def click_and_wait(self, element, action, url_pattern=None, methods=MUTATING_METHODS, timeout=30, required=True):
+        """Click an element and wait for the first matching request to complete.
+        Args:
+            element: The WebElement to click (clicked via JavaScript).
+            action (str): Business action name used in logs and timings.
+            url_pattern (str): JavaScript regex of the action's endpoint, so unrelated
+                requests (autosave, polling, telemetry) are not taken for it. If empty, the
+                first matching-method request is taken and a missing one is only logged.
+            methods (list): HTTP methods to match; None matches any method.
+            timeout (float): Seconds to wait for the request.
+            required (bool): Raise if no request completes; otherwise log and return None.
+        Returns:
+            dict: The request (method, url, status, duration in ms), or None if not required and none seen.
+        Raises:
+            BackendRequestError: If the server answered with an error status, or if
+                required and no matching request completed in time.
+        """
+        if not url_pattern:
+            logger.warning(f"{action}: no endpoint pattern configured; taking the first {methods or 'any'} request")
+            required = False
+        ensure_script_timeout(self.driver, timeout + 5)
+        request = self.driver.execute_async_script(INSTALL_SCRIPT + CLICK_AND_WAIT_SCRIPT,
+                                                   element, url_pattern, methods, int(timeout * 1000))
+        if request is None:
+            if required:
+                raise BackendRequestError(f"{action}: no request to /{url_pattern}/ completed within {timeout}s")
+            logger.warning(f"{action}: no matching request seen within {timeout}s")
+            return None
+        self.timings.append({"action": action, **request})
+        logger.info(f"{action}: {request['method']} {request['url']} -> {request['status']} in {request['duration']}ms")
+        if not 200 <= request["status"] < 400:
+            raise BackendRequestError(f"{action}: {request['method']} {request['url']} failed with status {request['status']}")
+        return request
+
+    def mark(self):
+        """Return the sequence number of the last request started, for wait_since()."""
+        return self.driver.execute_script(INSTALL_SCRIPT + "return window.__network.seq;")
+
+    def wait_since(self, since, action, url_pattern=None, methods=("GET",), timeout=10):
+        """Wait for the first matching request started after mark() to complete.
+
+        For actions that are not clicks (typing, Enter in a search box).
+        Args:
+            since (int): Value returned by mark() before the action.
+            action (str): Action name used in logs and timings.
+            url_pattern (str): Optional JavaScript regex of the endpoint.
+            methods (list): HTTP methods to match; None matches any method.
+            timeout (float): Seconds to wait.
+        Returns:
+            dict: The request (method, url, status, duration in ms), or None if none completed in time.
+        """
+        ensure_script_timeout(self.driver, timeout + 5)
+        request = self.driver.execute_async_script(INSTALL_SCRIPT + WAIT_SINCE_SCRIPT, since, url_pattern,
+                                                   list(methods) if methods else None, int(timeout * 1000))
+        if request is None:
+            logger.warning(f"{action}: no matching request seen within {timeout}s")
+            return None
+        self.timings.append({"action": action, **request})
+        logger.info(f"{action}: {request['method']} {request['url']} -> {request['status']} in {request['duration']}ms")
+        return request
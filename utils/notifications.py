@@ -0,0 +1,136 @@
+"""In-page recorder for antd notifications (toasts).
+
+A MutationObserver pushes every `.ant-notification-notice` that appears into a
+ring buffer on `window`, so toasts that show and disappear between two checks
+are still seen. On Chromium the recorder is also registered through CDP to run
+at document start, so it survives full page loads.
+"""
+
+import logging
+from selenium.common.exceptions import TimeoutException
+from utils.wait import ensure_script_timeout
+
+logger = logging.getLogger(__name__)
+
+RING_CAPACITY = 100
+
+INSTALL_SCRIPT = """
+    (function (capacity) {
+        if (window.__notifications) { return; }
+        var state = window.__notifications = {seq: 0, entries: [], listeners: []};
+        function typeOf(notice) {
+            var match = /ant-notification-notice-(?:icon-)?(success|info|warning|error)/.exec(notice.innerHTML + ' ' + notice.className);
+            return match ? match[1] : null;
+        }
+        function text(notice, cls) {
+            var el = notice.querySelector('.' + cls);
+            return el ? el.textContent.replace(/\\s+/g, ' ').trim() : '';
+        }
+        function record(notice) {
+            if (notice.__recorded) { return; }
+            notice.__recorded = true;
+            var entry = {
+                seq: ++state.seq,
+                message: text(notice, 'ant-notification-notice-message'),
+                description: text(notice, 'ant-notification-notice-description'),
+                type: typeOf(notice),
+                timestamp: Date.now()
+            };
+            state.entries.push(entry);
+            if (state.entries.length > capacity) { state.entries.shift(); }
+            state.listeners.slice().forEach(function (listener) { listener(entry); });
+        }
+        function scan(node) {
+            if (node.nodeType !== 1) { return; }
+            if (node.classList.contains('ant-notification-notice')) { record(node); }
+            node.querySelectorAll('.ant-notification-notice').forEach(record);
+        }
+        new MutationObserver(function (mutations) {
+            mutations.forEach(function (mutation) { mutation.addedNodes.forEach(scan); });
+        }).observe(document, {childList: true, subtree: true});
+        if (document.documentElement) { scan(document.documentElement); }
+    })(%d);
+""" % RING_CAPACITY
+
+WAIT_SCRIPT = """
+    var done = arguments[arguments.length - 1];
+    var text = arguments[0], type = arguments[1], since = arguments[2], timeout = arguments[3];
+    var state = window.__notifications;
+    function match(entry) {
+        return entry.seq > since && entry.message.indexOf(text) !== -1 && (!type || entry.type === type);
+    }
+    var found = state.entries.filter(match).pop();
+    if (found) { return done(found); }
+    var timer;
+    var listener = function (entry) {
+        if (!match(entry)) { return; }
+        clearTimeout(timer);
+        state.listeners.splice(state.listeners.indexOf(listener), 1);
+        done(entry);
+    };
+    timer = setTimeout(function () {
+        state.listeners.splice(state.listeners.indexOf(listener), 1);
+        done(null);
+    }, timeout);
+    state.listeners.push(listener);
+"""
+
+
+class NotificationRecorder:
+    """Python side of the in-page notification ring buffer."""
+
+    def __init__(self, driver):
+        """Install the recorder in the current page (idempotent).
+        Args:
+            driver: The WebDriver instance.
+        """
+        self.driver = driver
+        self.install()
+
+    def install(self):
+        """Inject the recorder now and, on Chromium, for every new document."""
+        if hasattr(self.driver, "execute_cdp_cmd") and not getattr(self.driver, "_notification_recorder", False):
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INSTALL_SCRIPT})
+            self.driver._notification_recorder = True
+        self.driver.execute_script(INSTALL_SCRIPT)
+
+    def _run(self, script, *args):
+        """Run a script against the buffer, installing the recorder first if the page lost it."""
+        return self.driver.execute_script(INSTALL_SCRIPT + script, *args)
+
+    def entries(self, since=0):
+        """Return recorded notifications newer than the given sequence number."""
+        return self._run("var since = arguments[0];"
+                         "return window.__notifications.entries.filter(function (e) { return e.seq > since; });", since)
+
+    def drain(self):
+        """Return and clear all recorded notifications."""
+        return self._run("return window.__notifications.entries.splice(0);")
+
+    def mark(self):
+        """Return the current sequence number, to match only notifications shown after it."""
+        return self._run("return window.__notifications.seq;")
+
+    def find(self, text, type=None, since=0):
+        """Return the latest recorded notification containing text, or None."""
+        matches = [e for e in self.entries(since) if text in e["message"] and (type is None or e["type"] == type)]
+        return matches[-1] if matches else None
+
+    def wait_for(self, text="", type=None, since=0, timeout=7):
+        """Return a notification containing text, waiting in-page until one is recorded.
+        Args:
+            text (str): Substring of the notification message ("" matches any).
+            type (str): Optional notification type (success, info, warning, error).
+            since (int): Only match notifications recorded after this sequence number.
+            timeout (float): Seconds to wait.
+        Returns:
+            dict: The notification entry (seq, message, description, type, timestamp).
+        Raises:
+            TimeoutException: If no matching notification is recorded in time.
+        """
+        ensure_script_timeout(self.driver, timeout + 5)
+        entry = self.driver.execute_async_script(INSTALL_SCRIPT + WAIT_SCRIPT, text, type, since, int(timeout * 1000))
+        if entry is None:
+            raise TimeoutException(f"No notification containing '{text}' within {timeout}s")
+        logger.info(f"Notification [{entry['type']}]: {entry['message']}")
+        return entry
@@ -0,0 +1,104 @@
+"""Browser resource sampling and leak detection.
+
+Each sample records RSS and CPU of the driver service and its browser process
+tree (via psutil, when installed) plus JS heap size and DOM node count from
+CDP Performance.getMetrics (Chromium only). Samples are taken at test
+boundaries and after each workflow step; growth between the first and last
+sample is compared against thresholds to flag tests that leak, which is also
+the signal for recycling a long-lived browser.
+"""
+
+import json
+import logging
+import time
+
+import config.config as cfg
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class ResourceMonitor:
+    """Collects a time series of resource samples for one WebDriver session."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.samples = []
+        self._processes = {}
+        self._cdp = hasattr(driver, "execute_cdp_cmd")
+        if self._cdp:
+            try:
+                driver.execute_cdp_cmd("Performance.enable", {})
+            except Exception as e:
+                logger.debug(f"CDP performance metrics unavailable: {e}")
+                self._cdp = False
+
+    def _process_tree(self):
+        """Return psutil processes of the driver service and all its descendants."""
+        service = getattr(self.driver, "service", None)
+        process = getattr(service, "process", None)
+        if psutil is None or process is None:
+            return []
+        try:
+            root = psutil.Process(process.pid)
+            tree = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return []
+        # Reuse Process objects so cpu_percent measures the interval since the previous sample
+        processes = []
+        for proc in tree:
+            processes.append(self._processes.setdefault(proc.pid, proc))
+        return processes
+
+    def _os_metrics(self):
+        rss, cpu = 0, 0.0
+        for proc in self._process_tree():
+            try:
+                rss += proc.memory_info().rss
+                cpu += proc.cpu_percent(interval=None)
+            except psutil.Error:
+                continue
+        return {"rss_mb": round(rss / MB, 1), "cpu_percent": round(cpu, 1)} if rss else {}
+
+    def _page_metrics(self):
+        if not self._cdp:
+            return {}
+        try:
+            metrics = {m["name"]: m["value"] for m in self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+        except Exception as e:
+            logger.debug(f"Performance.getMetrics failed: {e}")
+            return {}
+        return {"js_heap_mb": round(metrics.get("JSHeapUsedSize", 0) / MB, 1), "dom_nodes": int(metrics.get("Nodes", 0))}
+
+    def sample(self, label):
+        """Record a sample tagged with label (e.g. 'setup', a workflow step, 'teardown')."""
+        entry = {"label": label, "time": round(time.time(), 3), **self._os_metrics(), **self._page_metrics()}
+        self.samples.append(entry)
+        return entry
+
+    def growth(self):
+        """Return the change of each metric between the first and last sample."""
+        if len(self.samples) < 2:
+            return {}
+        first, last = self.samples[0], self.samples[-1]
+        return {key: round(last[key] - first[key], 1) for key in ("rss_mb", "js_heap_mb", "dom_nodes")
+                if key in first and key in last}
+
+    def exceeded(self):
+        """Return the metrics whose growth is over the configured thresholds."""
+        limits = {"rss_mb": cfg.RESOURCE_RSS_GROWTH_MB, "js_heap_mb": cfg.RESOURCE_HEAP_GROWTH_MB,
+                  "dom_nodes": cfg.RESOURCE_DOM_GROWTH}
+        return {key: value for key, value in self.growth().items() if value > limits[key]}
+
+    def should_recycle(self):
+        """True if the session grew past a threshold and its browser should not be reused."""
+        return bool(self.exceeded())
+
+    def to_json(self):
+        return json.dumps({"samples": self.samples, "growth": self.growth(), "exceeded": self.exceeded()}, indent=2)
@@ -15,7 +15,8 @@ def retry_on_failure(max_attempts=cfg.MAX_RETRY_ATTEMPTS):
                     return func(*args, **kwargs)
                 except Exception as e:
                     logger.warning(f"[Retry {attempt + 1}/{max_attempts}] {func.__name__} failed: {e}")
-                    if attempt == max_attempts - 1:
+                    # Errors marked non-retryable (e.g. a rejected backend mutation) must not be repeated
+                    if attempt == max_attempts - 1 or not getattr(e, "retryable", True):
                         if args and hasattr(args[0], "driver"):
                             args[0].driver.save_screenshot(f"error_{func.__name__}_attempt{attempt}.png")
                         raise
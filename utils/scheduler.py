@@ -0,0 +1,184 @@
+"""Duration-aware test scheduling for pytest-xdist.
+
+Historical per-case durations are read from the Allure `*-result.json` files
+(start/stop timestamps), loose or packed by utils.allure_store, and kept in an
+index in the pytest cache, rebuilt only when the result files change. Under
+xdist the pending queue is ordered longest-first, so long workflow cases start
+early and short ones fill the gaps (LPT scheduling). Cases without history get the median of their test function,
+or of the whole suite.
+"""
+
+import glob
+import json
+import logging
+import os
+from statistics import median
+
+import pytest
+import config.config as cfg
+from utils.allure_store import iter_entries
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "clinic/durations"
+DEFAULT_DURATION = 60.0
+
+
+def _nodeid(result):
+    """Build the pytest node id of an Allure result from its titlePath and name."""
+    parts = result.get("titlePath") or []
+    files = [p for p in parts if p.endswith(".py")]
+    if not files:
+        return None
+    split = parts.index(files[0]) + 1
+    return "::".join(["/".join(parts[:split])] + parts[split:] + [result["name"]])
+
+
+def iter_results(reports_dir):
+    """Yield the parsed Allure results of a results directory, loose files and packed runs."""
+    for path in glob.glob(os.path.join(reports_dir, "*-result.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                yield json.load(file)
+        except (OSError, ValueError):
+            continue
+    for _, data in iter_entries(os.path.join(reports_dir, "runs"), "-result.json"):
+        try:
+            yield json.loads(data)
+        except ValueError:
+            continue
+
+
+def _signature(reports_dir):
+    """Cheap fingerprint of the results directory used to invalidate the index."""
+    entries = [e for e in os.scandir(reports_dir) if e.name.endswith("-result.json")] if os.path.isdir(reports_dir) else []
+    archive_dir = os.path.join(reports_dir, "runs")
+    if os.path.isdir(archive_dir):
+        entries += [e for e in os.scandir(archive_dir) if e.name.endswith(".zip")]
+    return [len(entries), max((e.stat().st_mtime for e in entries), default=0)]
+
+
+def build_index(reports_dir):
+    """Return {node_id: median duration in seconds} from historical results."""
+    samples = {}
+    for result in iter_results(reports_dir):
+        nodeid = _nodeid(result)
+        if nodeid and result.get("start") and result.get("stop") and result.get("status") != "skipped":
+            samples.setdefault(nodeid, []).append((result["stop"] - result["start"]) / 1000)
+    return {nodeid: median(values) for nodeid, values in samples.items()}
+
+
+def load_durations(config, reports_dir):
+    """Load the duration index from the pytest cache, rebuilding it if the results changed."""
+    signature = _signature(reports_dir)
+    # config.cache is only set when the cache provider is enabled
+    cache = getattr(config, "cache", None)
+    cached = cache.get(CACHE_KEY, None) if cache else None
+    if cached and cached.get("signature") == signature:
+        return cached["durations"]
+    durations = build_index(reports_dir)
+    if cache:
+        cache.set(CACHE_KEY, {"signature": signature, "durations": durations})
+    logger.info(f"Indexed historical durations for {len(durations)} cases from {reports_dir}")
+    return durations
+
+
+class DurationEstimator:
+    """Estimate a case's duration from history, its test function, or the suite."""
+
+    def __init__(self, durations):
+        self.durations = durations
+        by_function = {}
+        for nodeid, duration in durations.items():
+            by_function.setdefault(nodeid.split("[")[0], []).append(duration)
+        self.function_medians = {name: median(values) for name, values in by_function.items()}
+        self.default = median(durations.values()) if durations else DEFAULT_DURATION
+
+    def __call__(self, nodeid):
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        return self.function_medians.get(nodeid.split("[")[0], self.default)
+
+
+def estimate_makespan(durations, workers):
+    """Makespan of a longest-first greedy assignment of durations to workers."""
+    loads = [0.0] * max(workers, 1)
+    for duration in sorted(durations, reverse=True):
+        loads[loads.index(min(loads))] += duration
+    return max(loads)
+
+
+# Tests each worker is dealt up front, so it has the next test queued while the first runs
+INITIAL_ROUNDS = 2
+
+
+def deal(items, nodes, rounds=INITIAL_ROUNDS):
+    """Deal the head of a longest-first queue one item per node in turn.
+
+    Args:
+        items (list): Pending items, longest first.
+        nodes (list): Workers.
+        rounds (int): Items per worker to deal.
+
+    Returns:
+        list: (node, item) pairs in dealing order; node i gets items i, i + n, ...
+    """
+    pairs = []
+    for turn in range(min(len(items), rounds * len(nodes))):
+        pairs.append((nodes[turn % len(nodes)], items[turn]))
+    return pairs
+
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:
+    LoadScheduling = None
+
+if LoadScheduling:
+    class DurationScheduling(LoadScheduling):
+        """LoadScheduling that hands out the longest pending cases first, one at a time.
+
+        LoadScheduling sends each worker a chunk of consecutive items (at least
+        two), which would put the longest cases back to back on the first
+        worker. Here the initial distribution deals the sorted queue one case
+        per worker in turn, and each refill sends a single case, so a worker
+        that finishes takes the longest one still pending (greedy LPT).
+        """
+
+        def __init__(self, config, log=None, estimator=None):
+            super().__init__(config, log)
+            self.estimator = estimator
+            self.maxschedchunk = 1
+
+        def schedule(self):
+            """Initial distribution: deal the longest-first queue round-robin."""
+            assert self.collection_is_completed
+            if self.collection is not None:
+                # Initial distribution already happened; refill on all nodes
+                for node in self.nodes:
+                    self.check_schedule(node)
+                return
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
+            self.collection = list(self.node2collection.values())[0]
+            if not self.collection:
+                return
+            estimates = {index: self.estimator(nodeid) for index, nodeid in enumerate(self.collection)}
+            self.pending[:] = sorted(estimates, key=estimates.get, reverse=True)
+            logger.info(f"Longest-first schedule: total {sum(estimates.values()):.0f}s, "
+                        f"estimated makespan {estimate_makespan(estimates.values(), len(self.nodes)):.0f}s "
+                        f"on {len(self.nodes)} workers")
+            for node, _ in deal(list(self.pending), self.nodes):
+                self._send_tests(node, 1)
+            if not self.pending:
+                for node in self.nodes:
+                    node.shutdown()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Use duration-aware scheduling unless another --dist mode was requested."""
+    if LoadScheduling is None or config.getoption("dist", "load") != "load":
+        return None
+    return DurationScheduling(config, log, DurationEstimator(load_durations(config, cfg.REPORTS_DIR)))
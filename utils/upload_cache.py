@@ -0,0 +1,125 @@
+"""Pre-processed, content-addressed upload fixtures.
+
+Images are resized/re-encoded once into a cache keyed by the SHA-256 of their
+content and the variant (max size, format), shared by all workers and runs.
+When the session transfers files to the browser host (a remote session with a
+LocalFileDetector, as on a grid), each file is uploaded once per session and the
+returned remote path is reused; local sessions get the cached path directly.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+
+from PIL import Image
+from selenium.webdriver.remote.file_detector import UselessFileDetector
+import config.config as cfg
+
+logger = logging.getLogger(__name__)
+
+# (path, mtime, size) -> content hash, so unchanged sources are hashed once per process
+_source_hashes = {}
+# (session_id, content hash) -> path of the file on the browser host
+_remote_paths = {}
+# Variant keys whose source already satisfies the variant and is used as is
+_passthrough = set()
+
+FORMATS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG"}
+
+
+def _sha256(path):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+    if key not in _source_hashes:
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        _source_hashes[key] = digest.hexdigest()
+    return _source_hashes[key]
+
+
+def prepare(path, max_size=None, image_format=None, cache_dir=None):
+    """Return the cached variant of an image, creating it on first use.
+
+    Args:
+        path (str): Source image.
+        max_size (int): Longest side in pixels; larger images are downscaled (0/None keeps the size).
+        image_format (str): Target extension such as "jpg" or "png" (None keeps the source format).
+        cache_dir (str): Cache directory (defaults to config UPLOAD_CACHE_DIR).
+
+    Returns:
+        tuple: (absolute path of the variant, its content hash).
+    """
+    max_size = cfg.UPLOAD_MAX_SIZE if max_size is None else max_size
+    image_format = image_format or cfg.UPLOAD_FORMAT
+    ext = f".{image_format.lower().lstrip('.')}" if image_format else os.path.splitext(path)[1].lower()
+    if not max_size and ext == os.path.splitext(path)[1].lower():
+        return os.path.abspath(path), _sha256(path)
+    cache_dir = cache_dir or cfg.UPLOAD_CACHE_DIR
+    source_hash = _sha256(path)
+    digest = hashlib.sha256(f"{source_hash}:{max_size}:{ext}".encode()).hexdigest()
+    if digest in _passthrough:
+        return os.path.abspath(path), source_hash
+    target = os.path.join(cache_dir, f"{digest}{ext}")
+    if not os.path.exists(target):
+        os.makedirs(cache_dir, exist_ok=True)
+        with Image.open(path) as image:
+            if max(image.size) <= max_size and ext == os.path.splitext(path)[1].lower():
+                # Already small enough: re-encoding would only cost time
+                _passthrough.add(digest)
+                return os.path.abspath(path), source_hash
+            if max_size and max(image.size) > max_size:
+                image.thumbnail((max_size, max_size))
+            if FORMATS.get(ext) == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            # Write then rename so concurrent workers never read a partial file
+            fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=ext)
+            with os.fdopen(fd, "wb") as file:
+                image.save(file, format=FORMATS.get(ext, ext[1:].upper()), optimize=True)
+        os.replace(tmp, target)
+        logger.info(f"Prepared upload variant {os.path.basename(path)} -> {target}")
+    return os.path.abspath(target), digest
+
+
+def _transfers_files(driver, path):
+    """True if send_keys would ship the file to the browser host (remote session with a file detector)."""
+    if not getattr(driver, "_is_remote", False):
+        return False
+    detector = getattr(driver, "file_detector", None)
+    return detector is not None and detector.is_local_file(path) is not None
+
+
+def upload_files(driver, input_el, paths, max_size=None, image_format=None):
+    """Send files to a file input, transferring each to the browser host at most once per session.
+
+    Args:
+        driver: The WebDriver instance.
+        input_el: The <input type="file"> element.
+        paths (list): Source files.
+        max_size (int): See prepare().
+        image_format (str): See prepare().
+
+    Returns:
+        list: The paths sent to the input (remote paths for transferred files).
+    """
+    targets = []
+    for path in paths:
+        local, digest = prepare(path, max_size, image_format)
+        if _transfers_files(driver, local):
+            key = (driver.session_id, digest)
+            if key not in _remote_paths:
+                _remote_paths[key] = input_el._upload(local)
+                logger.info(f"Uploaded {os.path.basename(local)} to session {driver.session_id}")
+            targets.append(_remote_paths[key])
+        else:
+            targets.append(local)
+    # The paths are already on the browser host; stop send_keys from transferring them again
+    with driver.file_detector_context(UselessFileDetector):
+        if len(targets) > 1 and input_el.get_attribute("multiple"):
+            input_el.send_keys("\n".join(targets))
+        else:
+            for target in targets:
+                input_el.send_keys(target)
+    return targets
@@ -0,0 +1,159 @@
+"""Visual regression checks for page regions.
+
+A region is captured as an element screenshot and compared against a stored
+baseline with NumPy: masked dynamic areas (timestamps, patient names) are
+blanked in both images, identical buffers short-circuit the common case, a
+cheap integer channel bound clears near-identical ones, and the luminance diff
+is only computed inside the bounding box of the pixels that changed. On mismatch the expected/actual/diff
+images are attached under the names the bundled Allure screen-diff plugin
+renders, with the `testType: screenshotDiff` label it looks for.
+"""
+
+import io
+import logging
+import os
+
+import numpy as np
+from PIL import Image
+import config.config as cfg
+
+logger = logging.getLogger(__name__)
+
+# Per-pixel luminance difference (0-255) below which pixels count as equal
+PIXEL_TOLERANCE = 16
+
+MASK_RECTS_SCRIPT = """
+    var root = arguments[0].getBoundingClientRect(), ratio = window.devicePixelRatio || 1, rects = [];
+    arguments[1].forEach(function (xpath) {
+        var found = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < found.snapshotLength; i++) {
+            var r = found.snapshotItem(i).getBoundingClientRect();
+            rects.push([(r.left - root.left) * ratio, (r.top - root.top) * ratio, r.width * ratio, r.height * ratio]);
+        }
+    });
+    return rects;
+"""
+
+
+def _luminance(image):
+    return image[..., 0] * 0.299 + image[..., 1] * 0.587 + image[..., 2] * 0.114
+
+
+def _changed_box(expected, actual):
+    """Return (row slice, column slice) bounding all pixels that differ in any channel."""
+    changed = np.any(expected != actual, axis=2)
+    rows, cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+    return slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1)
+
+
+def apply_masks(image, rects):
+    """Return a copy of image with the given (x, y, w, h) rectangles blanked."""
+    masked = image.copy()
+    for x, y, w, h in rects:
+        x0, y0 = max(int(x), 0), max(int(y), 0)
+        masked[y0:max(int(y + h), y0), x0:max(int(x + w), x0)] = 0
+    return masked
+
+
+def compare(expected, actual, rects=(), tolerance=PIXEL_TOLERANCE):
+    """Compare two RGB images.
+
+    Args:
+        expected (np.ndarray): Baseline image (H, W, 3) uint8.
+        actual (np.ndarray): Captured image (H, W, 3) uint8.
+        rects (list): (x, y, w, h) regions to ignore.
+        tolerance (int): Luminance difference tolerated per pixel.
+
+    Returns:
+        tuple: (ratio of differing pixels, boolean diff mask or None if no pixel differs).
+    """
+    if expected.shape != actual.shape:
+        return 1.0, np.ones(actual.shape[:2], dtype=bool)
+    shape = actual.shape
+    expected, actual = apply_masks(expected, rects), apply_masks(actual, rects)
+    if np.array_equal(expected, actual):
+        return 0.0, None
+    box = _changed_box(expected, actual)
+    expected, actual = expected[box].astype(np.int16), actual[box].astype(np.int16)
+    if np.abs(expected - actual).max() <= tolerance:
+        # Luminance is a convex mix of the channels, so it cannot differ more than the largest channel
+        return 0.0, None
+    delta = np.abs(_luminance(expected.astype(np.float32)) - _luminance(actual.astype(np.float32)))
+    diff = np.zeros(shape[:2], dtype=bool)
+    diff[box] = delta > tolerance
+    return float(diff.mean()), diff if diff.any() else None
+
+
+def render_diff(actual, diff, rects=()):
+    """Highlight differing pixels in red over a dimmed copy of the actual image; masks are grey."""
+    image = (actual * 0.4).astype(np.uint8)
+    if diff is not None:
+        image[diff] = [255, 0, 0]
+    for x, y, w, h in rects:
+        x0, y0 = max(int(x), 0), max(int(y), 0)
+        image[y0:max(int(y + h), y0), x0:max(int(x + w), x0)] = 128
+    return image
+
+
+def _to_png(image):
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _attach(expected, actual, diff_image):
+    """Attach images in the layout the screen-diff plugin renders."""
+    try:
+        import allure
+    except ImportError:
+        return
+    allure.dynamic.label("testType", "screenshotDiff")
+    for name, image in (("expected", expected), ("actual", actual), ("diff", diff_image)):
+        if image is not None:
+            allure.attach(_to_png(image), name=name, attachment_type=allure.attachment_type.PNG)
+
+
+class VisualCheck:
+    """Capture page regions and compare them against stored baselines."""
+
+    def __init__(self, driver, baseline_dir=None, threshold=None):
+        self.driver = driver
+        self.baseline_dir = baseline_dir or cfg.VISUAL_BASELINE_DIR
+        self.threshold = cfg.VISUAL_THRESHOLD if threshold is None else threshold
+
+    def capture(self, element):
+        """Return an element screenshot as an RGB array."""
+        return np.asarray(Image.open(io.BytesIO(element.screenshot_as_png)).convert("RGB"))
+
+    def mask_rects(self, element, mask_xpaths):
+        """Return mask rectangles (in screenshot pixels) for all elements matched by the XPaths."""
+        if not mask_xpaths:
+            return []
+        return self.driver.execute_script(MASK_RECTS_SCRIPT, element, list(mask_xpaths))
+
+    def check(self, name, element, mask_xpaths=()):
+        """Compare an element against the baseline `name`, recording it on first use.
+
+        Args:
+            name (str): Baseline name (file name without extension).
+            element: The WebElement whose region is compared.
+            mask_xpaths (list): XPaths of dynamic elements to ignore.
+
+        Returns:
+            bool: True if the differing-pixel ratio is within the threshold.
+        """
+        actual = self.capture(element)
+        rects = self.mask_rects(element, mask_xpaths)
+        path = os.path.join(self.baseline_dir, f"{name}.png")
+        if cfg.VISUAL_UPDATE or not os.path.exists(path):
+            os.makedirs(self.baseline_dir, exist_ok=True)
+            Image.fromarray(actual).save(path)
+            logger.info(f"Visual baseline recorded: {path}")
+            return True
+        expected = np.asarray(Image.open(path).convert("RGB"))
+        ratio, diff = compare(expected, actual, rects)
+        passed = ratio <= self.threshold
+        logger.info(f"Visual check '{name}': {ratio:.4%} pixels differ (threshold {self.threshold:.4%})")
+        if not passed:
+            _attach(expected, actual, render_diff(actual, diff, rects))
+        return passed
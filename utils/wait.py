@@ -0,0 +1,130 @@
+"""Wait engine that evaluates expected conditions inside the browser.
+
+WebDriverWait polls every 0.5s and each poll costs several WebDriver commands
+(find, is_displayed, is_enabled). BrowserWait keeps the same `until` API but
+compiles conditions from utils.conditions into one execute_async_script that
+re-checks on every DOM mutation (plus a short in-page interval for URL and
+style changes) and resolves as soon as the condition holds. Conditions it
+cannot compile, or scripts interrupted by a page load, fall back to
+WebDriverWait for the remaining time.
+"""
+
+import logging
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.conditions import BrowserCondition
+
+logger = logging.getLogger(__name__)
+
+# Locator strategies the in-page script can resolve
+_STRATEGIES = {By.XPATH: "xpath", By.ID: "id", By.CSS_SELECTOR: "css", By.CLASS_NAME: "class", By.NAME: "name"}
+
+WAIT_SCRIPT = """
+    var done = arguments[arguments.length - 1];
+    var kind = arguments[0], strategy = arguments[1], selector = arguments[2], arg = arguments[3], timeout = arguments[4];
+    function find() {
+        if (strategy === 'xpath') {
+            return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        if (strategy === 'id') { return document.getElementById(selector); }
+        if (strategy === 'class') { return document.getElementsByClassName(selector)[0] || null; }
+        if (strategy === 'name') { return document.getElementsByName(selector)[0] || null; }
+        return document.querySelector(selector);
+    }
+    function visible(el) {
+        if (!el.isConnected || !el.getClientRects().length) { return false; }
+        var style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.opacity !== '0';
+    }
+    function check() {
+        if (kind === 'url_contains') { return location.href.indexOf(arg) !== -1 ? true : null; }
+        var el = find();
+        if (kind === 'presence') { return el; }
+        if (kind === 'visible') { return el && visible(el) ? el : null; }
+        if (kind === 'clickable') { return el && visible(el) && !el.disabled ? el : null; }
+        if (kind === 'invisible') { return !el || !visible(el) ? true : null; }
+        if (kind === 'text') { return el && el.textContent.indexOf(arg) !== -1 ? true : null; }
+        return null;
+    }
+    var result = check();
+    if (result) { return done(result); }
+    var observer, interval, timer, finished = false;
+    function finish(value) {
+        if (finished) { return; }
+        finished = true;
+        observer.disconnect();
+        clearInterval(interval);
+        clearTimeout(timer);
+        done(value);
+    }
+    function recheck() {
+        var value = check();
+        if (value) { finish(value); }
+    }
+    observer = new MutationObserver(recheck);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    interval = setInterval(recheck, 50);
+    timer = setTimeout(function () { finish(null); }, timeout);
+"""
+
+
+def ensure_script_timeout(driver, seconds):
+    """Raise the session's async script timeout to at least `seconds`, skipping the command when already high enough."""
+    if getattr(driver, "_script_timeout", 0) < seconds:
+        driver.set_script_timeout(seconds)
+        driver._script_timeout = seconds
+
+
+class BrowserWait:
+    """Drop-in replacement for WebDriverWait that waits inside the page."""
+
+    def __init__(self, driver, timeout, poll_frequency=0.5, ignored_exceptions=None):
+        self._driver = driver
+        self._timeout = float(timeout)
+        self._fallback = WebDriverWait(driver, timeout, poll_frequency, ignored_exceptions)
+        self._poll_frequency = poll_frequency
+        self._ignored_exceptions = ignored_exceptions
+
+    def _compile(self, method):
+        """Return script arguments for a compilable condition, or None."""
+        if not isinstance(method, BrowserCondition):
+            return None
+        if method.locator is None:
+            return [method.kind, None, None, method.arg]
+        strategy = _STRATEGIES.get(method.locator[0])
+        if strategy is None:
+            return None
+        return [method.kind, strategy, method.locator[1], method.arg]
+
+    def until(self, method, message=""):
+        """Wait until the condition holds and return its value (element or True).
+        Raises:
+            TimeoutException: If the condition does not hold within the timeout.
+        """
+        args = self._compile(method)
+        if args is None:
+            return self._fallback.until(method, message)
+        start = time.monotonic()
+        try:
+            ensure_script_timeout(self._driver, self._timeout + 5)
+            result = self._driver.execute_async_script(WAIT_SCRIPT, *args, int(self._timeout * 1000))
+        except TimeoutException:
+            result = None
+        except WebDriverException as e:
+            # Page unloaded mid-wait or script blocked: poll over WebDriver for the remaining time
+            remaining = self._timeout - (time.monotonic() - start)
+            logger.debug(f"In-page wait for {method!r} interrupted ({e.msg}); falling back for {remaining:.1f}s")
+            if remaining <= 0:
+                raise TimeoutException(message)
+            return WebDriverWait(self._driver, remaining, self._poll_frequency, self._ignored_exceptions).until(method, message)
+        if not result:
+            raise TimeoutException(message or f"Timed out after {self._timeout}s waiting for {method!r}")
+        return result
+
+    def until_not(self, method, message=""):
+        """Wait until the condition is falsy (delegates to WebDriverWait)."""
+        return self._fallback.until_not(method, message)
@@ -0,0 +1,305 @@
+"""Declarative workflow loader and call-plan compiler.
+
+A workflow file (JSON, or YAML when PyYAML is installed) lists the steps of a
+business flow. Step kinds:
+
+    {"call": "exam.enter_diagnosis", "args": ["$case.diagnosis"]}
+    {"assert": "exam.is_exam_completed", "message": "Exam not completed"}
+    {"wait_url_contains": "/examination/detail/"}
+    {"assert_url_contains": "/examination/detail/", "message": "Failed to reach exam page"}
+    {"wait_url_startswith": "https://clinic-local.amaz.com.vn/"}
+    {"fill": "exam", "fields": {"prescription.doctor_advice": "$case.doctor_advice"}}
+    {"prescription": {"doctor_advice": "...", "medicines": [{"name": ..., "fields": {...}}]}}
+
+Bindings are resolved per case: "$case.a.b" reads a nested key of the test case,
+{"$case": "a.b", "default": {}} adds a fallback, and "$file:data/x.png" expands to
+an absolute path under the project root. "medicines" may itself be a binding to
+a list in the test case.
+
+The plan is compiled once per file. Only consecutive "prescription" steps are
+regrouped: the tab is opened once, all medicines are added first (each row is
+found by the medicine name), and every tab field, medicine rows included, is
+set by one batched script call. Nothing is moved across another step, so a
+"fill" of the main form stays where it is written, and "call" steps run the
+page-object methods as written.
+
+Page objects (and Selenium) are imported on first use, so plans can be compiled
+and bindings resolved without a browser stack.
+"""
+
+import importlib
+import json
+import logging
+import os
+from functools import lru_cache
+
+from utils.logger import set_step
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Page name -> page-object class, given as a dotted path until first use
+PAGES = {
+    "login": "pages.login_page.LoginPage",
+    "patient": "pages.patient_page.PatientPage",
+    "exam": "pages.examination_page.ExaminationPage",
+    "payment": "pages.payment_page.PaymentPage",
+    "service_group": "pages.service_group_page.ServiceGroupPage",
+}
+
+
+class Op:
+    """A single compiled operation of a call plan.
+
+    tab names the page tab an operation belongs to; only operations of the
+    same tab are regrouped by the compiler.
+    """
+
+    def __init__(self, kind, page=None, target=None, args=None, message=None, tab=None):
+        self.kind = kind
+        self.page = page
+        self.target = target
+        self.args = args if args is not None else []
+        self.message = message
+        self.tab = tab
+
+    def __repr__(self):
+        return f"Op({self.kind}, {self.page}.{self.target})"
+
+
+def _load_spec(path):
+    """Read a workflow file as JSON or YAML."""
+    with open(path, "r", encoding="utf-8") as file:
+        if path.endswith((".yml", ".yaml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(f"PyYAML is required to load workflow {path}")
+            return yaml.safe_load(file)
+        return json.load(file)
+
+
+def page_class(name):
+    """Return the page-object class registered under name, importing it on first use."""
+    entry = PAGES[name]
+    if isinstance(entry, str):
+        module, _, attr = entry.rpartition(".")
+        entry = PAGES[name] = getattr(importlib.import_module(module), attr)
+    return entry
+
+
+def _split_target(target):
+    """Split 'page.method' and validate both parts against the page registry."""
+    page, _, method = target.partition(".")
+    if page not in PAGES:
+        raise ValueError(f"Unknown page '{page}' in workflow step '{target}'")
+    if method and not hasattr(page_class(page), method):
+        raise ValueError(f"{page_class(page).__name__} has no method '{method}'")
+    return page, method
+
+
+def _expand_step(step, index):
+    """Translate one declarative step into raw (unoptimized) operations."""
+    if "call" in step:
+        page, method = _split_target(step["call"])
+        return [Op("call", page, method, step.get("args", []))]
+    if "assert" in step:
+        page, method = _split_target(step["assert"])
+        return [Op("assert", page, method, step.get("args", []), step.get("message", step["assert"]))]
+    if "assert_url_contains" in step:
+        return [Op("assert_url", target="contains", args=[step["assert_url_contains"]],
+                   message=step.get("message", f"URL does not contain {step['assert_url_contains']}"))]
+    if "wait_url_contains" in step:
+        return [Op("wait_url", target="contains", args=[step["wait_url_contains"]])]
+    if "wait_url_startswith" in step:
+        return [Op("wait_url", target="startswith", args=[step["wait_url_startswith"]])]
+    if "fill" in step:
+        page, _ = _split_target(step["fill"])
+        fields = [("locator", path, value) for path, value in step["fields"].items()]
+        return [Op("fill", page, args=fields)]
+    if "prescription" in step:
+        spec = step["prescription"]
+        tab = "open_prescription_tab"
+        ops = [Op("tab", "exam", tab, tab=tab)]
+        if "doctor_advice" in spec:
+            ops.append(Op("fill", "exam", args=[("locator", "prescription.doctor_advice", spec["doctor_advice"])], tab=tab))
+        medicines = spec.get("medicines", [])
+        _check_row_fields(medicines)
+        ops.append(Op("medicines", "exam", args=[(index, medicines)], tab=tab))
+        ops.append(Op("fill", "exam", args=[("rows", index, medicines)], tab=tab))
+        return ops
+    raise ValueError(f"Unknown workflow step: {step}")
+
+
+def _check_row_fields(medicines):
+    """Validate the row field names of a literal medicine list against the exam page."""
+    if not isinstance(medicines, list):
+        return
+    allowed = page_class("exam").ROW_FIELDS
+    for spec in medicines:
+        unknown = set(spec.get("fields", {})) - set(allowed)
+        if unknown:
+            raise ValueError(f"Unknown prescription row field(s) {sorted(unknown)} for '{spec.get('name')}'")
+
+
+def _optimize(ops):
+    """Regroup tab segments: one tab click, all medicine additions, then one merged fill.
+
+    A segment starts at a tab click and spans the following operations of the
+    same tab, so nothing written before the click is moved after it.
+    """
+    plan = []
+    i = 0
+    while i < len(ops):
+        op = ops[i]
+        if op.kind != "tab":
+            plan.append(op)
+            i += 1
+            continue
+        segment = []
+        while i < len(ops) and ops[i].tab == op.tab and ops[i].page == op.page:
+            segment.append(ops[i])
+            i += 1
+        medicines = [m for o in segment if o.kind == "medicines" for m in o.args]
+        fields = [f for o in segment if o.kind == "fill" for f in o.args]
+        plan.append(op)
+        if medicines:
+            plan.append(Op("medicines", op.page, args=medicines, tab=op.tab))
+        if fields:
+            plan.append(Op("fill", op.page, args=fields, tab=op.tab))
+    return plan
+
+
+def compile_workflow(spec):
+    """Compile a workflow spec into an optimized CallPlan.
+    Args:
+        spec (dict): Parsed workflow with a "steps" list.
+    Returns:
+        CallPlan: The compiled plan.
+    """
+    raw = [op for index, step in enumerate(spec["steps"]) for op in _expand_step(step, index)]
+    plan = _optimize(raw)
+    logger.info(f"Compiled workflow '{spec.get('name', '')}': {len(raw)} ops -> {len(plan)} ops")
+    return CallPlan(spec.get("name", ""), plan, spec.get("url_timeout", 50))
+
+
+@lru_cache(maxsize=None)
+def _load_plan(path, mtime):
+    return compile_workflow(_load_spec(path))
+
+
+def load_plan(path):
+    """Load and compile a workflow file, reusing the compiled plan while the file is unchanged."""
+    path = os.path.abspath(path)
+    return _load_plan(path, os.path.getmtime(path))
+
+
+def resolve(value, case):
+    """Resolve bindings in a (possibly nested) workflow value against a test case."""
+    if isinstance(value, str):
+        if value.startswith("$case."):
+            return _lookup(case, value[len("$case."):], None)
+        if value.startswith("$file:"):
+            return os.path.join(BASE_DIR, *value[len("$file:"):].split("/"))
+        return value
+    if isinstance(value, dict):
+        if "$case" in value:
+            return _lookup(case, value["$case"], value.get("default"))
+        return {k: resolve(v, case) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve(v, case) for v in value]
+    return value
+
+
+def _lookup(case, path, default):
+    current = case
+    for key in path.split("."):
+        if not isinstance(current, dict) or key not in current:
+            return default
+        current = current[key]
+    return current
+
+
+class CallPlan:
+    """An optimized, reusable sequence of page-object operations."""
+
+    def __init__(self, name, ops, url_timeout=50):
+        self.name = name
+        self.ops = ops
+        self.url_timeout = url_timeout
+
+    def run(self, driver, case):
+        """Execute the plan for a single test case.
+        Args:
+            driver: The WebDriver instance.
+            case (dict): Test case data used to resolve bindings.
+        Raises:
+            AssertionError: If an assert step returns a falsy value or the URL check fails.
+        """
+        from utils.wait import BrowserWait
+        from utils import conditions as EC
+
+        pages = {}
+        row_keys = {}
+        wait = BrowserWait(driver, self.url_timeout)
+        test_id = case.get("test_id")
+        monitor = getattr(driver, "resource_monitor", None)
+
+        def page(name):
+            if name not in pages:
+                pages[name] = page_class(name)(driver)
+            return pages[name]
+
+        for index, op in enumerate(self.ops):
+            step = f"{index + 1}:{op.kind}:{op.page or ''}.{op.target or ''}"
+            set_step(step)
+            if monitor:
+                monitor.sample(step)
+            logger.info(f"[{self.name}] step {index + 1}/{len(self.ops)}: {op.kind} {op.page or ''}.{op.target or ''}")
+            if op.kind == "call":
+                getattr(page(op.page), op.target)(*resolve(op.args, case))
+            elif op.kind == "assert":
+                assert getattr(page(op.page), op.target)(*resolve(op.args, case)), f"Test {test_id}: {op.message}"
+            elif op.kind == "assert_url":
+                expected = resolve(op.args[0], case)
+                assert expected in driver.current_url, f"Test {test_id}: {op.message}"
+            elif op.kind == "wait_url":
+                expected = resolve(op.args[0], case)
+                if op.target == "contains":
+                    wait.until(EC.url_contains(expected))
+                else:
+                    wait.until(lambda d: d.current_url.startswith(expected))
+            elif op.kind == "tab":
+                getattr(page(op.page), op.target)()
+            elif op.kind == "medicines":
+                for group, medicines in op.args:
+                    row_keys[group] = [page(op.page).add_medicine(spec["name"])
+                                       for spec in self._medicine_list(medicines, case)]
+            elif op.kind == "fill":
+                page(op.page).fill_fields(self._fill_targets(page(op.page), op.args, row_keys, case))
+
+    def _medicine_list(self, medicines, case):
+        """Resolve a medicine list, which may be a literal list or a case binding."""
+        return resolve(medicines, case) or []
+
+    def _fill_targets(self, page_obj, fields, row_keys, case):
+        """Turn merged fill entries into (xpath, value) pairs for a batched fill."""
+        from selenium.webdriver.common.by import By
+
+        targets = []
+        for entry in fields:
+            if entry[0] == "locator":
+                section, _, key = entry[1].partition(".")
+                by_type, xpath = page_obj.locators[section][key]
+                if by_type != By.XPATH:
+                    raise ValueError(f"Batched fill needs an XPath locator, got {by_type} for '{entry[1]}'")
+                targets.append((xpath, resolve(entry[2], case)))
+            else:
+                _, group, medicines = entry
+                for spec, key in zip(self._medicine_list(medicines, case), row_keys.get(group, [])):
+                    for field, value in spec.get("fields", {}).items():
+                        if field not in page_obj.ROW_FIELDS:
+                            raise ValueError(f"Unknown prescription row field '{field}' for '{spec.get('name')}'")
+                        targets.append((page_obj._get_row_locator(field, key), value))
+        return targets